@@ -1,18 +1,28 @@
 import os
 import psycopg2
-from datetime import datetime, timedelta
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+from datetime import datetime, timedelta, timezone
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import feedparser
-import urllib.request
+from lxml import etree
 import urllib.parse
 import logging
 import time  # Add time module for delays
 import re
 import json
-from textblob import TextBlob
+import glob
+import functools
+import threading
+import hashlib
+import csv
+import io
+from concurrent.futures import ThreadPoolExecutor
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from apify_client import ApifyClient
 import html
-from bs4 import BeautifulSoup
 from google.analytics.data_v1beta import BetaAnalyticsDataClient
 from google.analytics.data_v1beta.types import (
     DateRange,
@@ -51,20 +61,234 @@ APIFY_USAGE_GUARD_ENABLED = os.getenv('APIFY_USAGE_GUARD_ENABLED', '1') in ('1',
 APIFY_USAGE_SOFT_LIMIT_USD = float(os.getenv('APIFY_USAGE_SOFT_LIMIT_USD', '4.5'))
 APIFY_MAX_ITEMS = int(os.getenv('APIFY_MAX_ITEMS', '25'))
 
+# Dump raw Apify datasets to /app for debugging (off by default in production)
+APIFY_DEBUG_LOG = os.getenv('APIFY_DEBUG_LOG', '0') in ('1', 'true', 'True')
+APIFY_DEBUG_LOG_RETENTION_DAYS = 7
+
+# Shared HTTP session: keeps connections alive between calls and retries
+# transient server errors with short exponential backoff. The final response
+# is returned (not raised) so callers keep their own status code handling.
+# 429 is not retried: a rate limit comes straight back to the caller (Twitter's
+# window reset can be 15 minutes away; ingest_twitter falls back to Apify instead),
+# and Retry-After is ignored so a 503 cannot stall a job for the server's chosen delay.
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[500, 502, 503, 504],
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    ),
+))
+
+# Reddit RSS fetching: feeds are downloaded concurrently, then processed serially.
+# Unauthenticated clients get roughly 10 requests/minute officially and about 1/s in
+# practice for RSS, so every reddit.com request start is spaced by REDDIT_MIN_INTERVAL
+# and two workers are enough to keep that pace while one response is in flight.
+REDDIT_FETCH_WORKERS = 2
+REDDIT_MIN_INTERVAL = 1.0
+_reddit_rate_lock = threading.Lock()
+_reddit_next_request = 0.0
+# Source ingesters run concurrently in run_full_ingestion, one job per external host
+# (each holds at most one pooled connection at a time)
+INGESTION_WORKERS = 4
+
+# OpenAlex paging: page 1 gives the total count, remaining pages are fetched concurrently.
+# Page-number paging tops out at 10,000 results (50 pages of 200).
+OPENALEX_FETCH_WORKERS = 5
+OPENALEX_MAX_PAGES = 50
+# OpenAlex allows 10 requests/second; request starts are spaced to stay at 8/s
+OPENALEX_MIN_INTERVAL = 0.125
+_openalex_rate_lock = threading.Lock()
+_openalex_next_request = 0.0
+
+# Google subreddit discovery: result pages (50 results each) are fetched concurrently
+GOOGLE_SEARCH_PAGES = 3
+GOOGLE_RESULTS_PER_PAGE = 50
+GOOGLE_SEARCH_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Reddit requires User-Agent header to return RSS/XML instead of HTML
+# Use more complete headers to avoid blocking
+REDDIT_RSS_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/rss+xml, application/xml, text/xml, */*',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+REDDIT_SEARCH_HEADERS = {'User-Agent': 'Mozilla/5.0 (compatible; UmmaticsBot/1.0; +http://ummatics.org)'}
+
+# Lexicon-based analyzer shared by all local sentiment scoring (built once, lexicon load is the slow part)
+_VADER = SentimentIntensityAnalyzer()
+
+# Engine tag mixed into sentiment_cache keys so scores from a previous engine are not reused
+SENTIMENT_ENGINE = 'vader'
+
+# In-process memo of sentiment scores keyed on cleaned text (reposts, repeats across runs)
+SENTIMENT_LRU_SIZE = 50_000
+
+# Text cleaning patterns shared by the sentiment analyzers
+_RT_RE = re.compile(r"^RT\s+@\w+:\s*")
+_URL_RE = re.compile(r'http[s]?://\S+')
+_WS_RE = re.compile(r'\s+')
+
+# Namespace map for the Atom feeds Reddit serves as RSS
+_ATOM_NS = {'atom': 'http://www.w3.org/2005/Atom'}
+
+# Fallback for subreddit links that don't split cleanly
+_SUBREDDIT_RE = re.compile(r'/r/([a-zA-Z0-9_]+)')
+
+# Target URL of each Google result link (href="/url?q=...&amp;sa=..."), matched on the raw HTML
+_GOOGLE_HREF_RE = re.compile(r'href="[^"]*?/url\?q=([^&"]+)')
+
+# Mention filter: 'ummatic' also matches 'ummatics'
+_UMMATICS_RE = re.compile(r'ummatic', re.IGNORECASE)
+
+# ISO 8601 UTC timestamps returned by Twitter API v2 and Apify, passed to Postgres unparsed
+_ISO_RE = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?Z?$')
+
+
+# Connection pool shared by all ingestion jobs, created on first use.
+# Sized for run_full_ingestion's workers (one connection each) plus the scheduler jobs
+# that can overlap with it; when every connection is out, callers wait for one to be
+# returned (ThreadedConnectionPool.getconn would raise PoolError instead). A job must
+# not borrow a second connection while holding one; pass conn= down instead.
+DB_POOL_MAXCONN = INGESTION_WORKERS + 4
+_db_pool = None
+_db_pool_lock = threading.Lock()
+_db_pool_slots = threading.BoundedSemaphore(DB_POOL_MAXCONN)
+
+
+def _connection_alive(conn):
+    """True if a pooled connection still reaches the server (it may have been dropped while idle)"""
+    if conn.closed:
+        return False
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
 
 def get_db_connection():
-    """Create database connection"""
-    return psycopg2.connect(**DB_CONFIG)
+    """Borrow a live database connection from the pool; return it with put_db_connection()"""
+    global _db_pool
+    _db_pool_slots.acquire()
+    try:
+        if _db_pool is None:
+            with _db_pool_lock:
+                if _db_pool is None:
+                    _db_pool = ThreadedConnectionPool(minconn=1, maxconn=DB_POOL_MAXCONN, **DB_CONFIG)
+        # Every idle connection may be stale (e.g. after a database restart); discard each
+        # dead one so the pool opens a fresh connection in its place
+        for _ in range(DB_POOL_MAXCONN + 1):
+            conn = _db_pool.getconn()
+            if _connection_alive(conn):
+                return conn
+            logger.warning("Discarding dead pooled database connection")
+            _db_pool.putconn(conn, close=True)
+        raise psycopg2.OperationalError("No live database connection available from the pool")
+    except Exception:
+        _db_pool_slots.release()
+        raise
+
+
+def put_db_connection(conn):
+    """Return a borrowed connection to the pool (no-op for None)"""
+    if conn is not None:
+        _db_pool.putconn(conn)
+        _db_pool_slots.release()
+
+
+def _openalex_throttle():
+    """Wait for this thread's turn so OpenAlex requests start at most every OPENALEX_MIN_INTERVAL seconds"""
+    global _openalex_next_request
+    with _openalex_rate_lock:
+        now = time.monotonic()
+        start = max(now, _openalex_next_request)
+        _openalex_next_request = start + OPENALEX_MIN_INTERVAL
+    time.sleep(start - now)
+
+
+def _reddit_throttle():
+    """Wait for this thread's turn so reddit.com requests start at most every REDDIT_MIN_INTERVAL seconds"""
+    global _reddit_next_request
+    with _reddit_rate_lock:
+        now = time.monotonic()
+        start = max(now, _reddit_next_request)
+        _reddit_next_request = start + REDDIT_MIN_INTERVAL
+    time.sleep(start - now)
 
 
 def get_current_week_dates():
     """Get the start and end dates of the current week (Monday to Sunday)"""
-    today = datetime.now().date()
+    return _week_dates_for(datetime.now().date())
+
+
+@functools.lru_cache(maxsize=4)
+def _week_dates_for(today):
+    """Monday and Sunday of the week containing today (memoized per date)"""
     monday = today - timedelta(days=today.weekday())
     sunday = monday + timedelta(days=6)
     return monday, sunday
 
 
+def _fetch_feed(rss_url, headers=REDDIT_RSS_HEADERS):
+    """Download and parse a single Reddit RSS feed (safe to run in a worker thread)"""
+    _reddit_throttle()
+    response = SESSION.get(rss_url, headers=headers, timeout=30)
+    response.raise_for_status()
+    try:
+        return _parse_reddit_rss(response.content)
+    except etree.XMLSyntaxError as e:
+        # Reddit serves an HTML page instead of the feed when it blocks a client
+        logger.warning(f"Feed parsing error for {rss_url} (possibly blocked or invalid URL): {e}")
+        return []
+
+
+def _parse_reddit_rss(content):
+    """Parse a Reddit Atom feed into entry dicts (id, title, link, author, summary, published)"""
+    # A fresh parser per call: lxml parsers must not be shared between threads
+    parser = etree.XMLParser(resolve_entities=False, no_network=True)
+    root = etree.fromstring(content, parser)
+
+    entries = []
+    for e in root.iterfind('atom:entry', _ATOM_NS):
+        link = e.find('atom:link', _ATOM_NS)
+        published = e.findtext('atom:published', namespaces=_ATOM_NS) or e.findtext('atom:updated', namespaces=_ATOM_NS)
+        if published:
+            # Stored as naive UTC, matching what feedparser's published_parsed produced
+            published = datetime.fromisoformat(published.replace('Z', '+00:00'))
+            if published.tzinfo:
+                published = published.astimezone(timezone.utc).replace(tzinfo=None)
+        entries.append({
+            'id': e.findtext('atom:id', default='', namespaces=_ATOM_NS),
+            'title': e.findtext('atom:title', default='', namespaces=_ATOM_NS),
+            'link': link.get('href', '') if link is not None else '',
+            'author': e.findtext('atom:author/atom:name', default='Unknown', namespaces=_ATOM_NS),
+            'summary': e.findtext('atom:content', namespaces=_ATOM_NS) or e.findtext('atom:summary', default='', namespaces=_ATOM_NS),
+            'published': published,
+        })
+    return entries
+
+
+def _subreddit_from_link(link):
+    """Extract the lowercased subreddit name from a reddit.com/r/<name>/... link, or None"""
+    try:
+        name = link.split('/r/', 1)[1].split('/', 1)[0]
+    except IndexError:
+        return None
+    if name.isascii() and name.replace('_', '').isalnum():
+        return name.lower()
+    match = _SUBREDDIT_RE.search(link)
+    return match.group(1).lower() if match else None
+
+
 def get_apify_monthly_usage_status(apify_token):
     """Fetch Apify monthly usage status for cost guarding.
 
@@ -85,7 +309,7 @@ def get_apify_monthly_usage_status(apify_token):
         return status
 
     try:
-        me_resp = requests.get(
+        me_resp = SESSION.get(
             'https://api.apify.com/v2/users/me',
             params={'token': apify_token},
             timeout=15,
@@ -100,7 +324,7 @@ def get_apify_monthly_usage_status(apify_token):
         logger.warning(f"Could not fetch Apify account feature status: {e}")
 
     try:
-        usage_resp = requests.get(
+        usage_resp = SESSION.get(
             'https://api.apify.com/v2/users/me/usage/monthly',
             params={'token': apify_token},
             timeout=15,
@@ -146,117 +370,211 @@ def should_skip_apify_run(apify_token):
     return False, ''
 
 
+def _clean_text(text):
+    """Strip RT prefixes, URLs and ellipses and normalize whitespace before scoring"""
+    s = _RT_RE.sub('', str(text))
+    s = _URL_RE.sub('', s)
+    s = s.replace('…', ' ')
+    return _WS_RE.sub(' ', s).strip()
+
+
 def analyze_sentiment(text):
-    """Analyze sentiment using AWS Lambda transformer or TextBlob fallback.
+    """Analyze sentiment using AWS Lambda transformer or VADER fallback.
     
     Returns: (sentiment_label, sentiment_score)
     - sentiment_label: 'positive', 'negative', or 'neutral'
-    - sentiment_score: model confidence or polarity (rounded)
+    - sentiment_score: model confidence or compound polarity (rounded)
     """
     try:
-        # Check if Lambda sentiment is enabled
-        use_lambda = os.getenv('USE_LAMBDA_SENTIMENT', '0') in ('1', 'true', 'True')
-        
-        if use_lambda:
-            try:
-                from lambda_sentiment import analyze_sentiment_lambda
-                results = analyze_sentiment_lambda([text])
-                if results:
-                    return results[0]  # Returns (sentiment, score)
-                logger.warning("Lambda returned empty results, falling back to TextBlob")
-            except Exception as e:
-                logger.warning(f"Lambda sentiment unavailable, falling back to TextBlob: {e}")
-        
-        # Fallback to TextBlob (fast, lightweight)
-        if not text:
-            return 'neutral', 0.0
-
-        # Clean text: remove RT prefixes, urls, and trailing ellipses
-        import re
-        s = str(text)
-        s = re.sub(r"^RT\s+@\w+:\s*", '', s)
-        s = re.sub(r'http[s]?://\S+', '', s)
-        s = s.replace('…', ' ')
-        s = re.sub(r'\s+', ' ', s).strip()
-
-        blob = TextBlob(s)
-        polarity = blob.sentiment.polarity
-        if polarity > 0.1:
-            sentiment = 'positive'
-        elif polarity < -0.1:
-            sentiment = 'negative'
-        else:
-            sentiment = 'neutral'
-        return sentiment, round(polarity, 2)
+        return analyze_sentiment_batch([text])[0]
     except Exception as e:
         logger.warning(f"Error analyzing sentiment: {e}")
         return 'neutral', 0.0
 
-def analyze_sentiment_textblob(text):
-    """Analyze sentiment using TextBlob only (faster, for Reddit posts).
+def analyze_sentiment_batch(texts):
+    """Analyze a list of texts with one AWS Lambda call, or VADER as fallback.
+    
+    Returns: list of (sentiment_label, sentiment_score) in the same order as texts
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+
+    # Check if Lambda sentiment is enabled
+    use_lambda = os.getenv('USE_LAMBDA_SENTIMENT', '0') in ('1', 'true', 'True')
+    
+    if use_lambda:
+        try:
+            from lambda_sentiment import analyze_sentiment_lambda
+            # Send each distinct text once (retweets and copy-paste repeat a lot)
+            unique_texts = list(dict.fromkeys(texts))
+            results = analyze_sentiment_lambda(unique_texts)
+            if results and len(results) == len(unique_texts):
+                by_text = dict(zip(unique_texts, results))
+                return [by_text[text] for text in texts]  # List of (sentiment, score)
+            logger.warning("Lambda returned incomplete results, falling back to VADER")
+        except Exception as e:
+            logger.warning(f"Lambda sentiment unavailable, falling back to VADER: {e}")
+    
+    # Fallback to VADER (fast, lightweight)
+    return [analyze_sentiment_vader(text) for text in texts]
+
+def analyze_sentiment_vader(text):
+    """Analyze sentiment using VADER only (fast, for Reddit posts and tweets).
     Returns: (sentiment_label, sentiment_score)
     """
+    if not text:
+        return 'neutral', 0.0
+
+    return _vader_sentiment(_clean_text(text))
+
+
+@functools.lru_cache(maxsize=SENTIMENT_LRU_SIZE)
+def _vader_sentiment(cleaned):
+    """Score already-cleaned text with VADER's compound score (memoized per process)"""
     try:
-        if not text:
-            return 'neutral', 0.0
-
-        # Clean text
-        import re
-        s = str(text)
-        s = re.sub(r"^RT\s+@\w+:\s*", '', s)
-        s = re.sub(r'http[s]?://\S+', '', s)
-        s = s.replace('…', ' ')
-        s = re.sub(r'\s+', ' ', s).strip()
-
-        blob = TextBlob(s)
-        polarity = blob.sentiment.polarity
-        if polarity > 0.1:
-            sentiment = 'positive'
-        elif polarity < -0.1:
-            sentiment = 'negative'
-        else:
-            sentiment = 'neutral'
-        return sentiment, round(polarity, 2)
+        compound = _VADER.polarity_scores(cleaned)['compound']
+        return _label_for(compound), round(compound, 2)
     except Exception as e:
-        logger.warning(f"Error analyzing sentiment with TextBlob: {e}")
+        logger.warning(f"Error analyzing sentiment with VADER: {e}")
         return 'neutral', 0.0
 
 
-def update_sentiment_metrics(date, platform='Twitter'):
+def _label_for(polarity):
+    """Map a polarity score to a sentiment label using the 0.1/-0.1 cutoffs"""
+    if polarity > 0.1:
+        return 'positive'
+    if polarity < -0.1:
+        return 'negative'
+    return 'neutral'
+
+
+def analyze_sentiments_cached(cur, texts):
+    """Analyze a batch of texts, reusing scores stored in sentiment_cache by earlier runs.
+
+    All texts are looked up with a single query; only cache misses are scored
+    with VADER, and their results are written back for the next run.
+
+    Returns: list of (sentiment_label, sentiment_score) in the same order as texts
+    """
+    cleaned = [_clean_text(text) if text else '' for text in texts]
+    keys = [hashlib.sha1(f"{SENTIMENT_ENGINE}:{c}".encode('utf-8')).hexdigest() for c in cleaned]
+
+    # Savepoint so a missing/broken cache table never aborts the caller's transaction
+    cached = {}
+    use_db_cache = True
+    try:
+        cur.execute("SAVEPOINT sentiment_cache")
+        cur.execute(
+            "SELECT text_sha1, sentiment, score FROM sentiment_cache WHERE text_sha1 = ANY(%s)",
+            (list(set(keys)),)
+        )
+        cached = {key: (sentiment, float(score)) for key, sentiment, score in cur.fetchall()}
+    except psycopg2.Error as e:
+        logger.warning(f"Sentiment cache unavailable, scoring all texts: {e}")
+        cur.execute("ROLLBACK TO SAVEPOINT sentiment_cache")
+        use_db_cache = False
+
+    # Score each distinct uncached text once (through the in-process LRU shared across runs)
+    miss_texts = {key: text for key, text in zip(keys, cleaned) if key not in cached}
+    misses = {key: _vader_sentiment(text) if text else ('neutral', 0.0) for key, text in miss_texts.items()}
+    cached.update(misses)
+    results = [cached[key] for key in keys]
+
+    if misses and use_db_cache:
+        # Rows go in key order so concurrent ingesters lock overlapping keys in the same
+        # order and cannot deadlock on each other's uncommitted inserts
+        execute_values(cur, """
+            INSERT INTO sentiment_cache (text_sha1, sentiment, score)
+            VALUES %s
+            ON CONFLICT (text_sha1) DO NOTHING
+        """, sorted((key, sentiment, score) for key, (sentiment, score) in misses.items()))
+
+    logger.info(f"Sentiment cache: {len(texts) - len(misses)} hits, {len(misses)} scored")
+    return results
+
+
+def update_sentiment_metrics(date, platform='Twitter', conn=None):
     """Update daily sentiment metrics based on analyzed social mentions
 
     Args:
         date: The date to update metrics for
         platform: The social platform to update ('Twitter', 'Reddit', etc.)
+        conn: Optional open connection to reuse; the caller then owns the commit
     """
+    own_conn = conn is None
     try:
-        conn = get_db_connection()
+        if own_conn:
+            conn = get_db_connection()
         cur = conn.cursor()
+        if not own_conn:
+            # Keep a failure here from aborting the caller's transaction
+            cur.execute("SAVEPOINT sentiment_metrics")
 
-        # Count sentiment categories for the specified date and platform
+        # Count sentiment categories and upsert them in a single statement
         cur.execute("""
+            INSERT INTO social_sentiment_metrics (date, platform, positive_count, negative_count, neutral_count, unanalyzed_count, average_sentiment_score)
             SELECT
-                COUNT(CASE WHEN sentiment = 'positive' THEN 1 END) as positive_count,
-                COUNT(CASE WHEN sentiment = 'negative' THEN 1 END) as negative_count,
-                COUNT(CASE WHEN sentiment = 'neutral' THEN 1 END) as neutral_count,
-                COUNT(CASE WHEN sentiment IS NULL THEN 1 END) as unanalyzed_count,
-                AVG(CAST(sentiment_score AS FLOAT)) as avg_score
+                %s, %s,
+                COUNT(*) FILTER (WHERE sentiment = 'positive'),
+                COUNT(*) FILTER (WHERE sentiment = 'negative'),
+                COUNT(*) FILTER (WHERE sentiment = 'neutral'),
+                COUNT(*) FILTER (WHERE sentiment IS NULL),
+                COALESCE(AVG(CAST(sentiment_score AS FLOAT)), 0.0)
             FROM social_mentions
             WHERE platform = %s
             AND DATE(posted_at) = %s
-        """, (platform, date))
+            ON CONFLICT (date, platform)
+            DO UPDATE SET
+                positive_count = EXCLUDED.positive_count,
+                negative_count = EXCLUDED.negative_count,
+                neutral_count = EXCLUDED.neutral_count,
+                unanalyzed_count = EXCLUDED.unanalyzed_count,
+                average_sentiment_score = EXCLUDED.average_sentiment_score
+            RETURNING positive_count, negative_count, neutral_count, unanalyzed_count
+        """, (date, platform, platform, date))
+        positive, negative, neutral, unanalyzed = cur.fetchone()
 
-        result = cur.fetchone()
-        positive = result[0] if result[0] else 0
-        negative = result[1] if result[1] else 0
-        neutral = result[2] if result[2] else 0
-        unanalyzed = result[3] if result[3] else 0
-        avg_score = result[4] if result[4] else 0.0
+        if own_conn:
+            conn.commit()
+        cur.close()
+
+        logger.info(f"Sentiment metrics updated for {platform} on {date}: {positive} positive, {negative} negative, {neutral} neutral, {unanalyzed} unanalyzed")
+    except Exception as e:
+        logger.error(f"Error updating sentiment metrics for {platform}: {e}")
+        if not own_conn:
+            conn.cursor().execute("ROLLBACK TO SAVEPOINT sentiment_metrics")
+    finally:
+        if own_conn:
+            put_db_connection(conn)
+
+
+def update_sentiment_metrics_range(start_date, end_date, platform='Twitter'):
+    """Update daily sentiment metrics for every date in [start_date, end_date]
+
+    Days without mentions are still written (with zero counts), matching
+    one update_sentiment_metrics call per day.
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
 
-        # Insert or update sentiment metrics
+        # One grouped upsert for the whole range; m.platform is only NULL on empty days
         cur.execute("""
             INSERT INTO social_sentiment_metrics (date, platform, positive_count, negative_count, neutral_count, unanalyzed_count, average_sentiment_score)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            SELECT
+                d.day, %s,
+                COUNT(*) FILTER (WHERE m.sentiment = 'positive'),
+                COUNT(*) FILTER (WHERE m.sentiment = 'negative'),
+                COUNT(*) FILTER (WHERE m.sentiment = 'neutral'),
+                COUNT(*) FILTER (WHERE m.platform IS NOT NULL AND m.sentiment IS NULL),
+                COALESCE(AVG(CAST(m.sentiment_score AS FLOAT)), 0.0)
+            FROM generate_series(%s::date, %s::date, interval '1 day') AS d(day)
+            LEFT JOIN social_mentions m
+                ON m.platform = %s
+                AND DATE(m.posted_at) = d.day::date
+            GROUP BY d.day
             ON CONFLICT (date, platform)
             DO UPDATE SET
                 positive_count = EXCLUDED.positive_count,
@@ -264,15 +582,19 @@ def update_sentiment_metrics(date, platform='Twitter'):
                 neutral_count = EXCLUDED.neutral_count,
                 unanalyzed_count = EXCLUDED.unanalyzed_count,
                 average_sentiment_score = EXCLUDED.average_sentiment_score
-        """, (date, platform, positive, negative, neutral, unanalyzed, avg_score))
+            RETURNING date, positive_count, negative_count, neutral_count, unanalyzed_count
+        """, (platform, start_date, end_date, platform))
+        results = sorted(cur.fetchall())
 
         conn.commit()
         cur.close()
-        conn.close()
 
-        logger.info(f"Sentiment metrics updated for {platform} on {date}: {positive} positive, {negative} negative, {neutral} neutral, {unanalyzed} unanalyzed")
+        for day, positive, negative, neutral, unanalyzed in results:
+            logger.info(f"Sentiment metrics updated for {platform} on {day}: {positive} positive, {negative} negative, {neutral} neutral, {unanalyzed} unanalyzed")
     except Exception as e:
-        logger.error(f"Error updating sentiment metrics for {platform}: {e}")
+        logger.error(f"Error updating sentiment metrics for {platform} from {start_date} to {end_date}: {e}")
+    finally:
+        put_db_connection(conn)
 
 
 def ingest_google_alerts():
@@ -283,14 +605,20 @@ def ingest_google_alerts():
         logger.warning("Google Alerts RSS URL not configured")
         return
     
+    conn = None
     try:
-        feed = feedparser.parse(GOOGLE_ALERTS_RSS_URL)
+        response = SESSION.get(GOOGLE_ALERTS_RSS_URL, timeout=30)
+        response.raise_for_status()
+        feed = feedparser.parse(response.content)
         monday, sunday = get_current_week_dates()
         
         conn = get_db_connection()
         cur = conn.cursor()
         
-        new_mentions = 0
+        # Rows are written to an in-memory CSV buffer and loaded with a single COPY.
+        # Every field is quoted so empty strings stay empty instead of becoming NULL.
+        buf = io.StringIO()
+        writer = csv.writer(buf, quoting=csv.QUOTE_ALL)
         for entry in feed.entries:
             try:
                 title = entry.get('title', '')
@@ -299,28 +627,40 @@ def ingest_google_alerts():
                 published_at = datetime(*entry.published_parsed[:6]) if hasattr(entry, 'published_parsed') else datetime.now()
                 snippet = entry.get('summary', '')[:500]
                 
-                # Insert news mention
-                cur.execute("""
-                    INSERT INTO news_mentions (week_start_date, title, url, source, published_at, snippet)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (url, title) DO NOTHING
-                """, (monday, title, url, source, published_at, snippet))
-                
-                if cur.rowcount > 0:
-                    new_mentions += 1
+                writer.writerow((monday, title, url, source, published_at, snippet))
                     
             except Exception as e:
                 logger.error(f"Error processing news entry: {e}")
                 continue
+        buf.seek(0)
+        
+        # Stage the batch in a temp table, then insert whatever is not already stored
+        cur.execute("""
+            CREATE TEMP TABLE news_stage ON COMMIT DROP AS
+            SELECT week_start_date, title, url, source, published_at, snippet
+            FROM news_mentions WITH NO DATA
+        """)
+        cur.copy_expert("""
+            COPY news_stage (week_start_date, title, url, source, published_at, snippet)
+            FROM STDIN WITH CSV
+        """, buf)
+        cur.execute("""
+            INSERT INTO news_mentions (week_start_date, title, url, source, published_at, snippet)
+            SELECT week_start_date, title, url, source, published_at, snippet FROM news_stage
+            ON CONFLICT (url, title) DO NOTHING
+            RETURNING 1
+        """)
+        new_mentions = len(cur.fetchall())
         
         conn.commit()
         cur.close()
-        conn.close()
         
         logger.info(f"Google Alerts ingestion complete. New mentions: {new_mentions}")
         
     except Exception as e:
         logger.error(f"Error in Google Alerts ingestion: {e}")
+    finally:
+        put_db_connection(conn)
 
 
 def google_search_reddit_posts():
@@ -352,6 +692,7 @@ def google_search_reddit_posts():
     
     ingested_count = 0
     
+    conn = None
     try:
         # Google Custom Search API endpoint
         base_url = "https://www.googleapis.com/customsearch/v1"
@@ -371,7 +712,7 @@ def google_search_reddit_posts():
             }
             
             logger.info(f"Fetching Google CSE results (start={start_index})...")
-            response = requests.get(base_url, params=params, timeout=30)
+            response = SESSION.get(base_url, params=params, timeout=30)
             
             if response.status_code != 200:
                 logger.error(f"Google CSE request failed: {response.status_code} - {response.text[:200]}")
@@ -426,7 +767,8 @@ def google_search_reddit_posts():
                 headers = {
                     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
                 }
-                response = requests.get(json_url, headers=headers, timeout=15)
+                _reddit_throttle()
+                response = SESSION.get(json_url, headers=headers, timeout=15)
                 
                 if response.status_code != 200:
                     logger.warning(f"Failed to fetch post data: {post_url} (status: {response.status_code})")
@@ -498,16 +840,12 @@ def google_search_reddit_posts():
                     ingested_count += 1
                     logger.info(f"✓ Ingested from Google ({keyword_location}): r/{subreddit} - {title[:60]}...")
                 
-                # Rate limit for Reddit API
-                time.sleep(0.5)
-                
             except Exception as e:
                 logger.error(f"Error processing post {post_url}: {e}")
                 continue
         
         conn.commit()
         cur.close()
-        conn.close()
         
         logger.info(f"Google Reddit post ingestion complete. New posts: {ingested_count}/{len(post_urls)}")
         return ingested_count
@@ -515,6 +853,23 @@ def google_search_reddit_posts():
     except Exception as e:
         logger.error(f"Error in Google Reddit post search: {e}")
         return 0
+    finally:
+        put_db_connection(conn)
+
+
+def _fetch_google_page(search_url):
+    """Fetch one Google results page; returns its HTML, or None on failure"""
+    logger.info(f"Fetching Google search results: {search_url}")
+    try:
+        response = SESSION.get(search_url, headers=GOOGLE_SEARCH_HEADERS, timeout=30)
+    except requests.RequestException as e:
+        logger.error(f"Google search request failed: {e}")
+        return None
+    
+    if response.status_code != 200:
+        logger.error(f"Google search failed with status code {response.status_code}")
+        return None
+    return response.text
 
 
 def google_search_subreddits():
@@ -530,51 +885,42 @@ def google_search_subreddits():
     
     discovered_subreddits = set()
     
+    conn = None
     try:
         # Construct Google search query to search Reddit
         query = 'site:reddit.com "ummatics" OR "ummatic"'
-        search_url = f"https://www.google.com/search?q={urllib.parse.quote(query)}&num=50"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        logger.info(f"Fetching Google search results: {search_url}")
+        search_urls = [
+            f"https://www.google.com/search?q={urllib.parse.quote(query)}&num={GOOGLE_RESULTS_PER_PAGE}&start={page * GOOGLE_RESULTS_PER_PAGE}"
+            for page in range(GOOGLE_SEARCH_PAGES)
+        ]
         
-        response = requests.get(search_url, headers=headers, timeout=30)
+        # Fetch all result pages concurrently
+        with ThreadPoolExecutor(max_workers=GOOGLE_SEARCH_PAGES) as executor:
+            pages = list(executor.map(_fetch_google_page, search_urls))
         
-        if response.status_code != 200:
-            logger.error(f"Google search failed with status code {response.status_code}")
+        if not any(pages):
             return []
         
-        # Parse HTML response
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Extract links from search results
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag['href']
-            
-            # Google wraps URLs in /url?q=...&sa=... format
-            if '/url?q=' in href:
-                match_url = re.search(r'/url\?q=(.*?)&', href)
-                if match_url:
-                    url = urllib.parse.unquote(match_url.group(1))
-                    
-                    # Extract subreddit name from Reddit URL
-                    match_sub = re.search(r'reddit\.com/r/([a-zA-Z0-9_]+)/', url)
-                    if match_sub:
-                        subreddit = match_sub.group(1).lower()
-                        if subreddit not in ['all', 'popular', 'announcements', 'reddit']:
-                            discovered_subreddits.add(subreddit)
+        for page_html in filter(None, pages):
+            # Extract result links straight from the HTML (no parse tree needed)
+            for target in _GOOGLE_HREF_RE.findall(page_html):
+                url = urllib.parse.unquote(target)
+                
+                # Extract subreddit name from Reddit URL
+                subreddit = _subreddit_from_link(url) if 'reddit.com/r/' in url else None
+                if subreddit:
+                    if subreddit not in ['all', 'popular', 'announcements', 'reddit']:
+                        if subreddit not in discovered_subreddits:
                             logger.info(f"Discovered subreddit from Google search: r/{subreddit}")
+                        discovered_subreddits.add(subreddit)
         
         # Get current subreddits from environment
         current_urls = os.getenv('REDDIT_RSS_URLS', '').split(',')
         current_subreddits = set()
         for url in current_urls:
-            match = re.search(r'/r/([a-zA-Z0-9_]+)/', url)
-            if match:
-                current_subreddits.add(match.group(1).lower())
+            subreddit = _subreddit_from_link(url)
+            if subreddit:
+                current_subreddits.add(subreddit)
         
         # Check database for previously discovered subreddits
         conn = get_db_connection()
@@ -607,7 +953,6 @@ def google_search_subreddits():
             logger.info("No subreddits discovered via Google search")
         
         cur.close()
-        conn.close()
         
         logger.info(f"Google subreddit discovery complete. New: {len(new_subreddits)}")
         return list(new_subreddits)
@@ -615,6 +960,8 @@ def google_search_subreddits():
     except Exception as e:
         logger.error(f"Error in Google subreddit discovery: {e}")
         return []
+    finally:
+        put_db_connection(conn)
 
 
 def discover_new_subreddits():
@@ -627,39 +974,13 @@ def discover_new_subreddits():
 
     discovered_subreddits = set()
 
+    conn = None
     try:
         # Strategy 1: Sitewide search
         # This searches ALL of Reddit for posts containing the keywords
         search_query = "ummatic OR ummatics"
         search_url = f"https://www.reddit.com/search.rss?q={urllib.parse.quote(search_query)}"
 
-        logger.info(f"Fetching Reddit sitewide search RSS: {search_url}")
-
-        req = urllib.request.Request(
-            search_url,
-            headers={'User-Agent': 'Mozilla/5.0 (compatible; UmmaticsBot/1.0; +http://ummatics.org)'}
-        )
-
-        with urllib.request.urlopen(req, timeout=30) as response:
-            feed_content = response.read()
-
-        feed = feedparser.parse(feed_content)
-        logger.info(f"Found {len(feed.entries)} results from sitewide search")
-
-        # Extract subreddit names from the post links
-        for entry in feed.entries:
-            try:
-                link = entry.get('link', '')
-                match = re.search(r'reddit\.com/r/([a-zA-Z0-9_]+)/', link)
-                if match:
-                    subreddit = match.group(1).lower()
-                    if subreddit not in ['all', 'popular', 'announcements', 'reddit']:
-                        discovered_subreddits.add(subreddit)
-                        logger.info(f"Discovered subreddit from sitewide search: r/{subreddit}")
-            except Exception as e:
-                logger.error(f"Error processing search result: {e}")
-                continue
-
         # Strategy 2: Search within specific Islamic/Muslim subreddits
         # Reddit's sitewide search may miss older posts, so we also search within
         # specific subreddits where relevant content is likely to appear
@@ -670,25 +991,38 @@ def discover_new_subreddits():
             'saudiarabia', 'arabs', 'MiddleEastNews'
         ]
 
-        for subreddit in target_subreddits:
-            try:
+        # Issue the sitewide search and all targeted searches at once; results are
+        # processed in order below once every feed has arrived
+        logger.info(f"Fetching Reddit sitewide search RSS and {len(target_subreddits)} targeted searches...")
+        with ThreadPoolExecutor(max_workers=REDDIT_FETCH_WORKERS) as executor:
+            sitewide_future = executor.submit(_fetch_feed, search_url, REDDIT_SEARCH_HEADERS)
+            targeted_futures = {}
+            for subreddit in target_subreddits:
                 targeted_query = f"{search_query} subreddit:{subreddit}"
                 targeted_url = f"https://www.reddit.com/search.rss?q={urllib.parse.quote(targeted_query)}"
+                targeted_futures[subreddit] = executor.submit(_fetch_feed, targeted_url, REDDIT_SEARCH_HEADERS)
 
-                logger.info(f"Searching within r/{subreddit}...")
-
-                req = urllib.request.Request(
-                    targeted_url,
-                    headers={'User-Agent': 'Mozilla/5.0 (compatible; UmmaticsBot/1.0; +http://ummatics.org)'}
-                )
+        entries = sitewide_future.result()
+        logger.info(f"Found {len(entries)} results from sitewide search")
 
-                with urllib.request.urlopen(req, timeout=30) as response:
-                    feed_content = response.read()
+        # Extract subreddit names from the post links
+        for entry in entries:
+            try:
+                subreddit = _subreddit_from_link(entry.get('link', ''))
+                if subreddit:
+                    if subreddit not in ['all', 'popular', 'announcements', 'reddit']:
+                        discovered_subreddits.add(subreddit)
+                        logger.info(f"Discovered subreddit from sitewide search: r/{subreddit}")
+            except Exception as e:
+                logger.error(f"Error processing search result: {e}")
+                continue
 
-                feed = feedparser.parse(feed_content)
+        for subreddit, future in targeted_futures.items():
+            try:
+                entries = future.result()
 
-                if len(feed.entries) > 0:
-                    logger.info(f"  Found {len(feed.entries)} results in r/{subreddit}")
+                if len(entries) > 0:
+                    logger.info(f"  Found {len(entries)} results in r/{subreddit}")
                     # If we find results in this subreddit, add it to discovered list
                     discovered_subreddits.add(subreddit.lower())
 
@@ -700,9 +1034,9 @@ def discover_new_subreddits():
         current_urls = os.getenv('REDDIT_RSS_URLS', '').split(',')
         current_subreddits = set()
         for url in current_urls:
-            match = re.search(r'/r/([a-zA-Z0-9_]+)/', url)
-            if match:
-                current_subreddits.add(match.group(1).lower())
+            subreddit = _subreddit_from_link(url)
+            if subreddit:
+                current_subreddits.add(subreddit)
 
         # Find new subreddits not already being monitored
         new_subreddits = discovered_subreddits - current_subreddits
@@ -725,7 +1059,6 @@ def discover_new_subreddits():
                     logger.error(f"Error saving subreddit {subreddit}: {e}")
             conn.commit()
             cur.close()
-            conn.close()
         else:
             logger.info("No new subreddits discovered")
 
@@ -735,6 +1068,8 @@ def discover_new_subreddits():
     except Exception as e:
         logger.error(f"Error in subreddit discovery: {e}")
         return []
+    finally:
+        put_db_connection(conn)
 
 
 def ingest_reddit():
@@ -745,6 +1080,7 @@ def ingest_reddit():
         logger.warning("Reddit RSS URLs not configured")
         return
 
+    conn = None
     try:
         monday, sunday = get_current_week_dates()
         today = datetime.now().date()
@@ -754,36 +1090,24 @@ def ingest_reddit():
 
         total_new_mentions = 0
         total_mentions_today = 0
+        # Rows are collected across all feeds and inserted in one batch at the end
+        rows = []
+        sentiment_texts = []
 
-        for feed_index, rss_url in enumerate(REDDIT_RSS_URLS):
-            rss_url = rss_url.strip()
-            if not rss_url:
-                continue
+        # Fetch all feeds concurrently (pure network wait); entries are processed below
+        feed_urls = [url.strip() for url in REDDIT_RSS_URLS if url.strip()]
+        logger.info(f"Fetching {len(feed_urls)} Reddit RSS feeds...")
+        with ThreadPoolExecutor(max_workers=REDDIT_FETCH_WORKERS) as executor:
+            feed_futures = [(url, executor.submit(_fetch_feed, url)) for url in feed_urls]
 
+        for feed_index, (rss_url, future) in enumerate(feed_futures):
             try:
-                logger.info(f"Fetching Reddit RSS feed {feed_index + 1}/{len(REDDIT_RSS_URLS)}: {rss_url}")
-                # Reddit requires User-Agent header to return RSS/XML instead of HTML
-                # Use more complete headers to avoid blocking
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                    'Accept': 'application/rss+xml, application/xml, text/xml, */*',
-                    'Accept-Language': 'en-US,en;q=0.9',
-                }
-                req = urllib.request.Request(rss_url, headers=headers)
-                response = urllib.request.urlopen(req, timeout=30)
-                content = response.read()
-                feed = feedparser.parse(content)
+                entries = future.result()
+                logger.info(f"Processing Reddit RSS feed {feed_index + 1}/{len(feed_urls)}: {rss_url}")
 
-                logger.info(f"Found {len(feed.entries)} entries in feed")
-                
-                # Check if we got HTML error page instead of RSS
-                if hasattr(feed, 'bozo') and feed.bozo:
-                    logger.warning(f"Feed parsing error for {rss_url}: {feed.get('bozo_exception', 'Unknown error')}")
-                    if len(feed.entries) == 0:
-                        logger.error(f"No valid RSS entries found, possibly blocked or invalid URL")
-                        continue
+                logger.info(f"Found {len(entries)} entries in feed")
 
-                for entry_index, entry in enumerate(feed.entries):
+                for entry in entries:
                     try:
                         # Extract Reddit post details
                         post_id = entry.get('id', '')
@@ -798,8 +1122,7 @@ def ingest_reddit():
 
                         # Filter: Only include posts containing "ummatics" or "ummatic" (case insensitive)
                         # Check FULL summary first before trimming
-                        combined_text = f"{title} {full_summary}".lower()
-                        if 'ummatics' not in combined_text and 'ummatic' not in combined_text:
+                        if not _UMMATICS_RE.search(title) and not _UMMATICS_RE.search(full_summary):
                             continue  # Skip posts that don't mention ummatics/ummatic
 
                         # Decode HTML entities and strip tags before trimming
@@ -810,55 +1133,47 @@ def ingest_reddit():
                         # Now trim content for storage (after filtering and cleaning)
                         content = clean_summary[:1000]
 
-                        # Parse published date
-                        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                            posted_at = datetime(*entry.published_parsed[:6])
-                        else:
-                            posted_at = datetime.now()
+                        # Published date was parsed with the feed
+                        posted_at = entry['published'] or datetime.now()
 
                         # Reddit RSS doesn't provide engagement metrics, so we set them to 0
                         # In the future, you could scrape these or use an API
                         upvotes = 0
                         comments = 0
 
-                        # Analyze sentiment using TextBlob (fast, low memory)
-                        sentiment_text = f"{title} {content}"
-                        sentiment, sentiment_score = analyze_sentiment_textblob(sentiment_text)
-
-                        # Add small delay every 5 posts to avoid overloading
-                        if (entry_index + 1) % 5 == 0:
-                            time.sleep(0.5)  # 500ms delay
-
-                        # Insert Reddit mention
-                        cur.execute("""
-                            INSERT INTO social_mentions
-                            (week_start_date, platform, post_id, author, content, post_url, posted_at,
-                             likes, retweets, replies, sentiment, sentiment_score, sentiment_analyzed_at)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                            ON CONFLICT (post_id) DO NOTHING
-                        """, (monday, 'Reddit', post_id, author, content, post_url, posted_at,
-                              upvotes, 0, comments, sentiment, sentiment_score, datetime.now()))
-
-                        if cur.rowcount > 0:
-                            total_new_mentions += 1
-                            if posted_at.date() == today:
-                                total_mentions_today += 1
+                        # Sentiment is analyzed for the whole batch once all feeds are read
+                        rows.append((monday, 'Reddit', post_id, author, content, post_url, posted_at,
+                                     upvotes, 0, comments))
+                        sentiment_texts.append(f"{title} {content}")
 
                     except Exception as e:
                         logger.error(f"Error processing Reddit entry: {e}")
                         continue
 
                 # Log progress
-                logger.info(f"Processed {len(feed.entries)} entries from {rss_url}")
-
-                # Add delay between feeds to avoid rate limiting
-                if feed_index < len(REDDIT_RSS_URLS) - 1:
-                    time.sleep(2)  # 2 second delay between feeds
+                logger.info(f"Processed {len(entries)} entries from {rss_url}")
 
             except Exception as e:
                 logger.error(f"Error fetching Reddit RSS feed {rss_url}: {e}")
                 continue
 
+        # Insert all Reddit mentions in one multi-row statement
+        if rows:
+            # Analyze sentiment using VADER (fast, low memory), skipping texts seen before
+            sentiments = analyze_sentiments_cached(cur, sentiment_texts)
+            analyzed_at = datetime.now()
+            rows = [row + sentiment + (analyzed_at,) for row, sentiment in zip(rows, sentiments)]
+            inserted = execute_values(cur, """
+                INSERT INTO social_mentions
+                (week_start_date, platform, post_id, author, content, post_url, posted_at,
+                 likes, retweets, replies, sentiment, sentiment_score, sentiment_analyzed_at)
+                VALUES %s
+                ON CONFLICT (post_id) DO NOTHING
+                RETURNING posted_at
+            """, rows, page_size=500, fetch=True)
+            total_new_mentions = len(inserted)
+            total_mentions_today = sum(1 for (posted_at,) in inserted if posted_at and posted_at.date() == today)
+
         # Update daily metrics for Reddit (Reddit has no follower concept)
         if total_mentions_today > 0:
             cur.execute("""
@@ -872,16 +1187,17 @@ def ingest_reddit():
 
         # Update sentiment metrics for Reddit
         if total_new_mentions > 0:
-            update_sentiment_metrics(today, 'Reddit')
+            update_sentiment_metrics(today, 'Reddit', conn=conn)
 
         conn.commit()
         cur.close()
-        conn.close()
 
         logger.info(f"Reddit ingestion complete. New mentions: {total_new_mentions}")
 
     except Exception as e:
         logger.error(f"Error in Reddit ingestion: {e}")
+    finally:
+        put_db_connection(conn)
 
 
 def ingest_twitter(max_tweets=100, days_back=None):
@@ -897,20 +1213,16 @@ def ingest_twitter(max_tweets=100, days_back=None):
         logger.warning("Twitter Bearer Token not configured, skipping Twitter ingestion")
         return
 
+    conn = None
     try:
         monday, sunday = get_current_week_dates()
         today = datetime.now().date()
 
-        # Get existing tweet IDs AND max tweet ID + date from database to avoid duplicates
+        # One connection serves the whole ingestion run.
+        # Get the most recent tweet ID AND its created_at date for 7-day window iteration.
+        # Duplicates are checked later against just the fetched batch.
         conn = get_db_connection()
         cur = conn.cursor()
-        cur.execute("""
-            SELECT post_id FROM social_mentions 
-            WHERE platform = 'Twitter'
-        """)
-        existing_tweet_ids = set(row[0] for row in cur.fetchall())
-        
-        # Get the most recent tweet ID AND its created_at date for 7-day window iteration
         cur.execute("""
             SELECT post_id, created_at 
             FROM social_mentions 
@@ -922,11 +1234,10 @@ def ingest_twitter(max_tweets=100, days_back=None):
         since_id = last_tweet[0] if last_tweet else None
         last_tweet_date = last_tweet[1] if last_tweet else None
         
-        logger.info(f"Found {len(existing_tweet_ids)} existing tweets in database")
         if since_id and last_tweet_date:
             logger.info(f"Last tweet: ID={since_id}, date={last_tweet_date}")
-        cur.close()
-        conn.close()
+        # End the read transaction so the connection isn't left idle in transaction during API calls
+        conn.commit()
 
         all_tweets = []
 
@@ -1006,7 +1317,7 @@ def ingest_twitter(max_tweets=100, days_back=None):
                     window_params["end_time"] = window["end_time"]
                 
                 logger.info(f"Fetching window {window_idx + 1}/{len(time_windows)}: {window}")
-                response = requests.get(search_url, headers=headers, params=window_params)
+                response = SESSION.get(search_url, headers=headers, params=window_params, timeout=30)
 
                 # If Twitter returns 429 (rate limit), raise so Apify fallback runs
                 if response.status_code == 429:
@@ -1113,9 +1424,17 @@ def ingest_twitter(max_tweets=100, days_back=None):
                     dataset_items = list(client.dataset(run["defaultDatasetId"]).iterate_items())
                     logger.info(f"Apify dataset returned {len(dataset_items)} items for query: {search_query}")
                     
-                    # IMMEDIATELY log full data to file BEFORE processing (so we don't lose data on errors)
-                    if dataset_items:
-                        import json
+                    # Optionally log full data to file BEFORE processing (so we don't lose data on errors)
+                    if dataset_items and APIFY_DEBUG_LOG:
+                        # Rotate out dumps older than the retention window so /app doesn't fill up
+                        cutoff = time.time() - APIFY_DEBUG_LOG_RETENTION_DAYS * 86400
+                        for old_file in glob.glob('/app/apify_data_*.json'):
+                            try:
+                                if os.path.getmtime(old_file) < cutoff:
+                                    os.remove(old_file)
+                            except OSError as rm_err:
+                                logger.warning(f"Could not remove old Apify dump {old_file}: {rm_err}")
+
                         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                         log_file = f"/app/apify_data_{timestamp}_{search_query.replace(' ', '_').replace('-', '_')}.json"
                         try:
@@ -1153,7 +1472,7 @@ def ingest_twitter(max_tweets=100, days_back=None):
                 user_url = "https://api.twitter.com/2/users/by/username/ummatics"
                 headers = {"Authorization": f"Bearer {TWITTER_BEARER_TOKEN}"}
                 params = {"user.fields": "public_metrics"}
-                response = requests.get(user_url, headers=headers, params=params)
+                response = SESSION.get(user_url, headers=headers, params=params)
                 
                 if response.status_code == 200:
                     user_data = response.json()
@@ -1169,8 +1488,6 @@ def ingest_twitter(max_tweets=100, days_back=None):
         
         # Fallback to previous follower count from database if API fails or quota exhausted
         if follower_count == 0:
-            conn = get_db_connection()
-            cur = conn.cursor()
             cur.execute("""
                 SELECT follower_count FROM social_media_daily_metrics 
                 WHERE platform = 'Twitter' 
@@ -1180,41 +1497,38 @@ def ingest_twitter(max_tweets=100, days_back=None):
             if result and result[0] > 0:
                 follower_count = result[0]
                 logger.info(f"Using previous follower count from database: {follower_count}")
-            cur.close()
-            conn.close()
         
         # Process tweets and save to database
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
         new_mentions = 0
-        skipped_duplicates = 0
-        skipped_own_posts = 0
-        total_engagement = 0
+        rows = []
+        
+        # Index the batch by ID (overlapping search windows can return a tweet twice)
+        incoming = {tweet['id']: tweet for tweet in all_tweets if tweet.get('id')}
+        
+        # Look up only the IDs in this batch instead of loading every stored tweet ID
+        cur.execute("""
+            SELECT post_id FROM social_mentions
+            WHERE platform = 'Twitter'
+            AND post_id = ANY(%s)
+        """, (list(incoming),))
+        existing_tweet_ids = set(row[0] for row in cur.fetchall())
+        logger.info(f"{len(existing_tweet_ids)} of {len(incoming)} fetched tweets already in database")
+        
+        # Skip posts from @ummatics itself (double check) and tweets we already have, up front
+        own_post_ids = {tweet_id for tweet_id, tweet in incoming.items()
+                        if tweet.get('author', {}).get('userName', 'Unknown').lower() == 'ummatics'}
+        todo_ids = incoming.keys() - own_post_ids - existing_tweet_ids
+        skipped_own_posts = len(own_post_ids)
+        skipped_duplicates = len(incoming) - skipped_own_posts - len(todo_ids)
         
-        for tweet in all_tweets:
+        for tweet_id in todo_ids:
             try:
-                # Extract tweet data
-                tweet_id = tweet.get('id', '')
-                if not tweet_id:
-                    continue
+                tweet = incoming[tweet_id]
                 
                 # Get author info
                 author_info = tweet.get('author', {})
                 author_username = author_info.get('userName', 'Unknown')
                 
-                # Skip if this is from @ummatics itself (double check)
-                if author_username.lower() == 'ummatics':
-                    skipped_own_posts += 1
-                    logger.debug(f"Skipping own post: {tweet_id}")
-                    continue
-                
-                # Skip if we already have this tweet
-                if tweet_id in existing_tweet_ids:
-                    skipped_duplicates += 1
-                    logger.debug(f"Skipping duplicate tweet: {tweet_id}")
-                    continue
-                
                 # Extract tweet content and metadata
                 content = tweet.get('text', '')
                 post_url = tweet.get('url', f"https://twitter.com/{author_username}/status/{tweet_id}")
@@ -1224,15 +1538,17 @@ def ingest_twitter(max_tweets=100, days_back=None):
                 
                 # Parse created date - handle multiple formats
                 created_at = tweet.get('createdAt', '')
-                if created_at:
+                if created_at and _ISO_RE.match(created_at):
+                    # Common case: plain UTC ISO timestamp, Postgres parses it on insert
+                    posted_at = created_at
+                elif created_at:
                     try:
-                        # Try ISO format first (Apify format)
+                        # Try other ISO variants (e.g. explicit offsets)
                         posted_at = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
                     except (ValueError, TypeError):
                         try:
                             # Try Twitter's standard format: "Thu Mar 04 04:48:05 +0000 2010"
-                            from datetime import datetime as dt
-                            posted_at = dt.strptime(created_at, '%a %b %d %H:%M:%S %z %Y')
+                            posted_at = datetime.strptime(created_at, '%a %b %d %H:%M:%S %z %Y')
                         except (ValueError, TypeError):
                             # Fallback to now if all parsing fails
                             logger.warning(f"Could not parse date '{created_at}' for tweet {tweet_id}, using current time")
@@ -1245,27 +1561,31 @@ def ingest_twitter(max_tweets=100, days_back=None):
                 retweets = tweet.get('retweetCount', 0)
                 replies = tweet.get('replyCount', 0)
                 
-                total_engagement += likes + retweets + replies
-                
-                # Analyze sentiment using TextBlob
-                sentiment, sentiment_score = analyze_sentiment_textblob(content)
-                
-                # Insert into database
-                cur.execute("""
-                    INSERT INTO social_mentions 
-                    (week_start_date, platform, post_id, author, content, post_url, posted_at, likes, retweets, replies, sentiment, sentiment_score, sentiment_analyzed_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (post_id) DO NOTHING
-                """, (monday, 'Twitter', tweet_id, author_username, content, post_url, posted_at, likes, retweets, replies, sentiment, sentiment_score, datetime.now()))
-                
-                if cur.rowcount > 0:
-                    new_mentions += 1
-                    logger.info(f"Added new mention from @{author_username}: {tweet_id} (sentiment: {sentiment})")
+                # Sentiment is analyzed for all new tweets at once below
+                rows.append((monday, 'Twitter', tweet_id, author_username, content, post_url, posted_at,
+                             likes, retweets, replies))
                     
             except Exception as e:
                 logger.error(f"Error processing tweet: {e}")
                 continue
         
+        # Insert all new tweets in one multi-row statement
+        if rows:
+            # Analyze sentiment using VADER, skipping texts seen before
+            sentiments = analyze_sentiments_cached(cur, [row[4] for row in rows])
+            analyzed_at = datetime.now()
+            rows = [row + sentiment + (analyzed_at,) for row, sentiment in zip(rows, sentiments)]
+            inserted = execute_values(cur, """
+                INSERT INTO social_mentions 
+                (week_start_date, platform, post_id, author, content, post_url, posted_at, likes, retweets, replies, sentiment, sentiment_score, sentiment_analyzed_at)
+                VALUES %s
+                ON CONFLICT (post_id) DO NOTHING
+                RETURNING post_id, author, sentiment
+            """, rows, page_size=500, fetch=True)
+            new_mentions = len(inserted)
+            for tweet_id, author_username, sentiment in inserted:
+                logger.info(f"Added new mention from @{author_username}: {tweet_id} (sentiment: {sentiment})")
+        
         # Calculate engagement rate from ALL tweets posted today (not just new ones)
         # Engagement rate = (total engagement from all today's tweets / follower_count) * 100
         cur.execute("""
@@ -1295,12 +1615,11 @@ def ingest_twitter(max_tweets=100, days_back=None):
                 engagement_rate = EXCLUDED.engagement_rate
         """, (today, 'Twitter', follower_count, total_mentions_today, engagement_rate))
         
+        # Update sentiment metrics for today
+        update_sentiment_metrics(today, conn=conn)
+        
         conn.commit()
         cur.close()
-        conn.close()
-        
-        # Update sentiment metrics for today
-        update_sentiment_metrics(today)
         
         logger.info(f"Twitter ingestion complete. New mentions: {new_mentions}, Followers: {follower_count}")
         logger.info(f"Skipped {skipped_duplicates} duplicates and {skipped_own_posts} own posts")
@@ -1309,12 +1628,15 @@ def ingest_twitter(max_tweets=100, days_back=None):
         logger.error(f"Error in Twitter ingestion: {e}")
         import traceback
         logger.error(traceback.format_exc())
+    finally:
+        put_db_connection(conn)
 
 
 def cleanup_citations():
     """Clean up citations: check for dead URLs and remove duplicates"""
     logger.info("Starting citation cleanup...")
     
+    conn = None
     try:
         conn = get_db_connection()
         cur = conn.cursor()
@@ -1348,7 +1670,7 @@ def cleanup_citations():
                     headers = {
                         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
                     }
-                    response = requests.head(source_url, timeout=10, allow_redirects=True, headers=headers)
+                    response = SESSION.head(source_url, timeout=10, allow_redirects=True, headers=headers)
                     # Consider 4xx and 5xx status codes as dead
                     if response.status_code >= 400:
                         is_url_dead = True
@@ -1408,7 +1730,6 @@ def cleanup_citations():
         
         conn.commit()
         cur.close()
-        conn.close()
         
         logger.info(f"Citation cleanup complete:")
         logger.info(f"  - Checked {checked_count} citations")
@@ -1420,12 +1741,15 @@ def cleanup_citations():
         logger.error(f"Error in citation cleanup: {e}")
         import traceback
         logger.error(traceback.format_exc())
+    finally:
+        put_db_connection(conn)
 
 
 def ingest_openalex():
     """Fetch citation data from OpenAlex API"""
     logger.info("Starting OpenAlex ingestion...")
     
+    conn = None
     try:
         monday, sunday = get_current_week_dates()
         
@@ -1440,10 +1764,32 @@ def ingest_openalex():
             "sort": "cited_by_count:desc"
         }
         
+        def fetch_page(page):
+            _openalex_throttle()
+            response = SESSION.get(base_url, headers=headers, params={**params, "page": page}, timeout=30)
+            response.raise_for_status()
+            return response.json()
+        
+        def fetch_later_page(page):
+            # A failed page is logged and skipped so the pages that did arrive are still stored
+            try:
+                return fetch_page(page)
+            except (requests.RequestException, ValueError) as e:
+                logger.warning(f"Skipping OpenAlex page {page}: {e}")
+                return None
+        
         logger.info("Searching OpenAlex for works mentioning 'ummatics' or 'ummatic'...")
-        response = requests.get(base_url, headers=headers, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = fetch_page(1)
+        
+        # Fetch any further pages in parallel (throttled to OpenAlex's rate limit)
+        total_count = data.get('meta', {}).get('count', 0)
+        total_pages = min(-(-total_count // params['per_page']), OPENALEX_MAX_PAGES)
+        if total_pages > 1:
+            logger.info(f"Fetching {total_pages - 1} more OpenAlex pages ({total_count} works total)...")
+            with ThreadPoolExecutor(max_workers=OPENALEX_FETCH_WORKERS) as executor:
+                for page_data in executor.map(fetch_later_page, range(2, total_pages + 1)):
+                    if page_data is not None:
+                        data['results'].extend(page_data.get('results', []))
         
         works_found = len(data.get('results', []))
         logger.info(f"Found {works_found} works in OpenAlex")
@@ -1455,6 +1801,9 @@ def ingest_openalex():
         works_count = 0
         new_works = 0
         updated_works = 0
+        # Keyed by work_id: one upsert statement cannot touch the same row twice
+        rows = {}
+        updated_at = datetime.now()
         
         for work in data.get('results', []):
             try:
@@ -1464,7 +1813,7 @@ def ingest_openalex():
                 
                 # Extract authors
                 authors_list = work.get('authorships', [])
-                authors = ', '.join([a.get('author', {}).get('display_name', '') for a in authors_list[:5]])
+                authors = ', '.join(filter(None, (a.get('author', {}).get('display_name', '') for a in authors_list[:5])))
                 if len(authors_list) > 5:
                     authors += ' et al.'
                 
@@ -1511,33 +1860,32 @@ def ingest_openalex():
                 if citation_type == 'word' and 'ummatics' in full_text and 'ummatic' not in full_text.replace('ummatics', ''):
                     citation_type = 'organization'
                 
-                # Check if work already exists
-                cur.execute("SELECT work_id FROM citations WHERE work_id = %s", (work_id,))
-                exists = cur.fetchone()
-                
-                # Insert or update citation
-                cur.execute("""
-                    INSERT INTO citations (work_id, doi, title, authors, publication_date, cited_by_count, source_url, citation_type, updated_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (work_id) 
-                    DO UPDATE SET 
-                        cited_by_count = EXCLUDED.cited_by_count,
-                        citation_type = EXCLUDED.citation_type,
-                        updated_at = EXCLUDED.updated_at
-                    RETURNING (xmax = 0) AS inserted
-                """, (work_id, doi, title, authors, publication_date, cited_by_count, source_url, citation_type, datetime.now()))
-                
-                result = cur.fetchone()
-                if result and result[0]:
-                    new_works += 1
-                    logger.info(f"New work added: {title[:60]}... (citations: {cited_by_count})")
-                else:
-                    updated_works += 1
+                rows[work_id] = (work_id, doi, title, authors, publication_date, cited_by_count, source_url, citation_type, updated_at)
                     
             except Exception as e:
                 logger.error(f"Error processing OpenAlex work: {e}")
                 continue
         
+        # Insert or update all citations in one statement; xmax = 0 marks freshly inserted rows
+        if rows:
+            results = execute_values(cur, """
+                INSERT INTO citations (work_id, doi, title, authors, publication_date, cited_by_count, source_url, citation_type, updated_at)
+                VALUES %s
+                ON CONFLICT (work_id) 
+                DO UPDATE SET 
+                    cited_by_count = EXCLUDED.cited_by_count,
+                    citation_type = EXCLUDED.citation_type,
+                    updated_at = EXCLUDED.updated_at
+                RETURNING title, cited_by_count, (xmax = 0) AS inserted
+            """, list(rows.values()), page_size=500, fetch=True)
+            
+            for title, cited_by_count, inserted in results:
+                if inserted:
+                    new_works += 1
+                    logger.info(f"New work added: {title[:60]}... (citations: {cited_by_count})")
+                else:
+                    updated_works += 1
+        
         # Calculate new citations this week (simplified - compare with previous week)
         cur.execute("""
             SELECT total_citations FROM citation_metrics 
@@ -1562,7 +1910,6 @@ def ingest_openalex():
         
         conn.commit()
         cur.close()
-        conn.close()
         
         logger.info(f"OpenAlex ingestion complete:")
         logger.info(f"  - Total citations: {total_citations}")
@@ -1575,43 +1922,30 @@ def ingest_openalex():
         logger.error(f"Error in OpenAlex ingestion: {e}")
         import traceback
         logger.error(traceback.format_exc())
+    finally:
+        put_db_connection(conn)
 
 
 def update_weekly_snapshot():
     """Update the weekly snapshot with aggregated data"""
     logger.info("Updating weekly snapshot...")
     
+    conn = None
     try:
         monday, sunday = get_current_week_dates()
         
         conn = get_db_connection()
         cur = conn.cursor()
         
-        # Count news mentions
-        cur.execute("""
-            SELECT COUNT(*) FROM news_mentions WHERE week_start_date = %s
-        """, (monday,))
-        news_count = cur.fetchone()[0]
-        
-        # Count social mentions
-        cur.execute("""
-            SELECT COUNT(*) FROM social_mentions WHERE week_start_date = %s
-        """, (monday,))
-        social_count = cur.fetchone()[0]
-        
-        # Get total citations
+        # Gather news, social, citation and session totals in a single round-trip
         cur.execute("""
-            SELECT total_citations FROM citation_metrics WHERE week_start_date = %s
-        """, (monday,))
-        result = cur.fetchone()
-        citations_count = result[0] if result else 0
-        
-        # Get website sessions
-        cur.execute("""
-            SELECT total_sessions FROM website_metrics WHERE week_start_date = %s
-        """, (monday,))
-        result = cur.fetchone()
-        sessions_count = result[0] if result else 0
+            SELECT
+                (SELECT COUNT(*) FROM news_mentions WHERE week_start_date = %s),
+                (SELECT COUNT(*) FROM social_mentions WHERE week_start_date = %s),
+                COALESCE((SELECT total_citations FROM citation_metrics WHERE week_start_date = %s), 0),
+                COALESCE((SELECT total_sessions FROM website_metrics WHERE week_start_date = %s), 0)
+        """, (monday,) * 4)
+        news_count, social_count, citations_count, sessions_count = cur.fetchone()
         
         # Insert or update weekly snapshot
         cur.execute("""
@@ -1629,12 +1963,13 @@ def update_weekly_snapshot():
         
         conn.commit()
         cur.close()
-        conn.close()
         
         logger.info(f"Weekly snapshot updated for {monday} to {sunday}")
         
     except Exception as e:
         logger.error(f"Error updating weekly snapshot: {e}")
+    finally:
+        put_db_connection(conn)
 
 
 def update_reddit_rss_urls(new_subreddits):
@@ -1662,13 +1997,10 @@ def update_reddit_rss_urls(new_subreddits):
         for i, line in enumerate(lines):
             if line.startswith('REDDIT_RSS_URLS='):
                 current_value = line.split('=', 1)[1].strip()
-                # Add new subreddits
-                new_urls = [f"https://www.reddit.com/r/{sub}/.rss" for sub in new_subreddits]
-                if current_value:
-                    updated_value = f"{current_value},{','.join(new_urls)}"
-                else:
-                    updated_value = ','.join(new_urls)
-                lines[i] = f"REDDIT_RSS_URLS={updated_value}\n"
+                # Add new subreddits; the set keeps repeated runs from re-adding URLs
+                urls = set(filter(None, (url.strip() for url in current_value.split(','))))
+                urls.update(f"https://www.reddit.com/r/{sub}/.rss" for sub in new_subreddits)
+                lines[i] = f"REDDIT_RSS_URLS={','.join(sorted(urls))}\n"
                 updated = True
                 break
 
@@ -1689,20 +2021,46 @@ def run_full_ingestion():
     logger.info("Starting full data ingestion")
     logger.info("=" * 60)
 
-    try:
-        # Discover new subreddits first
+    def discover_subreddits():
         new_subreddits = discover_new_subreddits()
         if new_subreddits:
             update_reddit_rss_urls(new_subreddits)
             # Note: New subreddits will be used in next run after container restart
 
-        # Use Google to find Reddit posts (catches posts with keywords in comments)
-        google_search_reddit_posts()
-        
-        ingest_google_alerts()
-        ingest_reddit()
-        ingest_twitter()
-        ingest_openalex()
+    def reddit_sources():
+        # All three hit reddit.com, so they run one after another to keep Reddit
+        # seeing a single client; a failure in one step doesn't skip the rest
+        steps = [
+            discover_subreddits,
+            # Use Google to find Reddit posts (catches posts with keywords in comments)
+            google_search_reddit_posts,
+            ingest_reddit,
+        ]
+        for step in steps:
+            try:
+                step()
+            except Exception as e:
+                logger.error(f"Error in {step.__name__}: {e}")
+
+    try:
+        # One job per external host (Reddit, Google Alerts, Twitter/Apify, OpenAlex),
+        # so they run side by side; wall time is the slowest host, not the sum
+        jobs = [
+            reddit_sources,
+            ingest_google_alerts,
+            ingest_twitter,
+            ingest_openalex,
+        ]
+        with ThreadPoolExecutor(max_workers=INGESTION_WORKERS) as executor:
+            futures = {executor.submit(job): job.__name__ for job in jobs}
+
+        for future, name in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Error in {name}: {e}")
+
+        # The snapshot aggregates what the sources above wrote
         update_weekly_snapshot()
 
         logger.info("=" * 60)
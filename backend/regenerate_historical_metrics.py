@@ -16,31 +16,30 @@ DB_CONFIG = {
     'password': os.getenv('DB_PASSWORD', 'postgres')
 }
 
-def update_sentiment_metrics(target_date, platform):
+def update_sentiment_metrics(target_date, platform, conn=None):
     """Update sentiment metrics for a specific date and platform"""
-    conn = psycopg2.connect(**DB_CONFIG)
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(**DB_CONFIG)
     cur = conn.cursor()
     
-    # Get sentiment and scores for the date
+    # Count sentiment categories and average score for the date in one aggregate
     cur.execute("""
-        SELECT sentiment, sentiment_score 
+        SELECT 
+            COUNT(*) FILTER (WHERE sentiment = 'positive'),
+            COUNT(*) FILTER (WHERE sentiment = 'negative'),
+            COUNT(*) FILTER (WHERE sentiment = 'neutral'),
+            COUNT(*) FILTER (WHERE sentiment IS NULL OR sentiment = ''),
+            COALESCE(AVG(sentiment_score)::float, 0),
+            COUNT(*)
         FROM social_mentions 
         WHERE platform = %s 
         AND DATE(posted_at) = %s
     """, (platform, target_date))
     
-    rows = cur.fetchall()
+    positive_count, negative_count, neutral_count, unanalyzed_count, avg_score, total = cur.fetchone()
     
-    if rows:
-        positive_count = sum(1 for r in rows if r[0] == 'positive')
-        negative_count = sum(1 for r in rows if r[0] == 'negative')
-        neutral_count = sum(1 for r in rows if r[0] == 'neutral')
-        unanalyzed_count = sum(1 for r in rows if r[0] is None or r[0] == '')
-        
-        # Calculate average score from numeric sentiment_score column
-        valid_scores = [float(r[1]) for r in rows if r[1] is not None]
-        avg_score = sum(valid_scores) / len(valid_scores) if valid_scores else 0
-        
+    if total:
         # Insert or update sentiment metrics
         cur.execute("""
             INSERT INTO social_sentiment_metrics 
@@ -56,93 +55,105 @@ def update_sentiment_metrics(target_date, platform):
         """, (target_date, platform, positive_count, negative_count, neutral_count, unanalyzed_count, avg_score))
         
         conn.commit()
-        print(f"✓ {target_date}: {len(rows)} mentions (+{positive_count} -{negative_count} ={neutral_count}), avg: {avg_score:.3f}")
+        print(f"✓ {target_date}: {total} mentions (+{positive_count} -{negative_count} ={neutral_count}), avg: {avg_score:.3f}")
     
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
 
-def regenerate_all_metrics():
+def regenerate_all_metrics(conn=None):
     """Regenerate metrics for all dates with Twitter mentions"""
-    conn = psycopg2.connect(**DB_CONFIG)
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(**DB_CONFIG)
     cur = conn.cursor()
     
-    # Get all unique dates with Twitter mentions
+    print("Regenerating metrics...\n")
+    
+    # Aggregate every date with Twitter mentions and upsert them in one statement
     cur.execute("""
-        SELECT DISTINCT DATE(posted_at) as date, COUNT(*) as count
+        INSERT INTO social_sentiment_metrics 
+        (date, platform, positive_count, negative_count, neutral_count, unanalyzed_count, average_sentiment_score)
+        SELECT 
+            DATE(posted_at),
+            platform,
+            COUNT(*) FILTER (WHERE sentiment = 'positive'),
+            COUNT(*) FILTER (WHERE sentiment = 'negative'),
+            COUNT(*) FILTER (WHERE sentiment = 'neutral'),
+            COUNT(*) FILTER (WHERE sentiment IS NULL OR sentiment = ''),
+            COALESCE(AVG(sentiment_score)::float, 0)
         FROM social_mentions 
         WHERE platform = 'Twitter'
-        GROUP BY DATE(posted_at)
-        ORDER BY date
+        GROUP BY 1, 2
+        ON CONFLICT (date, platform) 
+        DO UPDATE SET 
+            positive_count = EXCLUDED.positive_count,
+            negative_count = EXCLUDED.negative_count,
+            neutral_count = EXCLUDED.neutral_count,
+            unanalyzed_count = EXCLUDED.unanalyzed_count,
+            average_sentiment_score = EXCLUDED.average_sentiment_score
+        RETURNING date, positive_count + negative_count + neutral_count + unanalyzed_count,
+                  positive_count, negative_count, neutral_count, average_sentiment_score
     """)
     
-    dates = cur.fetchall()
+    dates = sorted(cur.fetchall())
+    conn.commit()
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
     
-    print(f"Found {len(dates)} unique dates with Twitter mentions")
-    print(f"Date range: {dates[0][0]} to {dates[-1][0]}")
-    print("Regenerating metrics...\n")
+    for date, total, positive_count, negative_count, neutral_count, avg_score in dates:
+        print(f"✓ {date}: {total} mentions (+{positive_count} -{negative_count} ={neutral_count}), avg: {avg_score:.3f}")
     
-    for date, count in dates:
-        update_sentiment_metrics(date, 'Twitter')
+    print(f"\nFound {len(dates)} unique dates with Twitter mentions")
+    if dates:
+        print(f"Date range: {dates[0][0]} to {dates[-1][0]}")
     
     print(f"\n✅ Complete! Regenerated metrics for {len(dates)} dates")
 
-def regenerate_daily_metrics():
+def regenerate_daily_metrics(conn=None):
     """Regenerate daily metrics for all dates"""
-    conn = psycopg2.connect(**DB_CONFIG)
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(**DB_CONFIG)
     cur = conn.cursor()
     
-    # Get all unique dates
+    # For historical dates, we don't have follower count data
+    # Use the most recent follower count or 0
     cur.execute("""
-        SELECT DISTINCT DATE(posted_at) as date
+        SELECT follower_count 
+        FROM social_media_daily_metrics 
+        WHERE platform = 'Twitter' 
+        AND follower_count IS NOT NULL
+        ORDER BY date DESC 
+        LIMIT 1
+    """)
+    
+    result = cur.fetchone()
+    follower_count = result[0] if result else 0
+    
+    # Count mentions for every date and upsert them in one statement
+    cur.execute("""
+        INSERT INTO social_media_daily_metrics (date, platform, follower_count, mentions_count)
+        SELECT DATE(posted_at), 'Twitter', %s, COUNT(*)
         FROM social_mentions 
         WHERE platform = 'Twitter'
-        ORDER BY date
-    """)
+        GROUP BY DATE(posted_at)
+        ON CONFLICT (date, platform) 
+        DO UPDATE SET mentions_count = EXCLUDED.mentions_count
+        RETURNING date, mentions_count
+    """, (follower_count,))
     
-    dates = [row[0] for row in cur.fetchall()]
+    dates = sorted(cur.fetchall())
+    conn.commit()
     
     print(f"\nRegenerating daily metrics for {len(dates)} dates...")
-    
-    for date in dates:
-        # Get mention count for the date
-        cur.execute("""
-            SELECT COUNT(*) 
-            FROM social_mentions 
-            WHERE platform = 'Twitter' 
-            AND DATE(posted_at) = %s
-        """, (date,))
-        
-        mention_count = cur.fetchone()[0]
-        
-        # For historical dates, we don't have follower count data
-        # Use the most recent follower count or 0
-        cur.execute("""
-            SELECT follower_count 
-            FROM social_media_daily_metrics 
-            WHERE platform = 'Twitter' 
-            AND follower_count IS NOT NULL
-            ORDER BY date DESC 
-            LIMIT 1
-        """)
-        
-        result = cur.fetchone()
-        follower_count = result[0] if result else 0
-        
-        # Insert or update daily metrics
-        cur.execute("""
-            INSERT INTO social_media_daily_metrics (date, platform, follower_count, mentions_count)
-            VALUES (%s, %s, %s, %s)
-            ON CONFLICT (date, platform) 
-            DO UPDATE SET mentions_count = EXCLUDED.mentions_count
-        """, (date, 'Twitter', follower_count, mention_count))
-        
-        conn.commit()
+    for date, mention_count in dates:
         print(f"✓ {date}: {mention_count} mentions, {follower_count} followers")
     
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
     
     print(f"\n✅ Daily metrics complete!")
 
@@ -151,8 +162,13 @@ if __name__ == "__main__":
     print("REGENERATING HISTORICAL METRICS")
     print("=" * 60)
     
-    regenerate_all_metrics()
-    regenerate_daily_metrics()
+    # One connection for the whole run
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        regenerate_all_metrics(conn)
+        regenerate_daily_metrics(conn)
+    finally:
+        conn.close()
     
     print("\n" + "=" * 60)
     print("ALL METRICS REGENERATED SUCCESSFULLY")
@@ -8,7 +8,7 @@ import sys
 # Add parent directory to path to import ingestion module
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from ingestion import run_full_ingestion
-from ingestion import update_sentiment_metrics
+from ingestion import update_sentiment_metrics_range
 from ingestion import google_search_subreddits
 from ingestion import cleanup_citations
 from datetime import date, timedelta
@@ -63,18 +63,23 @@ def main():
     logger.info("  - Data ingestion: daily at 8:00 AM UTC")
     logger.info("=" * 60)
     
-    # Run initial ingestion on startup
-    logger.info("Running initial data ingestion...")
-    scheduled_ingestion()
+    # Run initial ingestion on startup in a scheduler worker so startup isn't blocked
+    logger.info("Queueing initial data ingestion...")
+    scheduler.add_job(
+        scheduled_ingestion,
+        trigger='date',
+        # No grace limit: still run if the scheduler starts a while after this is queued
+        misfire_grace_time=None,
+        id='startup_ingestion',
+        name='Startup Data Ingestion'
+    )
     # Run initial sentiment update for recent days
     def scheduled_sentiment():
         try:
             logger.info("Starting scheduled sentiment update for recent days...")
             today = datetime.now().date()
             # update sentiment metrics for the last 7 days (inclusive)
-            for i in range(0, 7):
-                d = today - timedelta(days=i)
-                update_sentiment_metrics(d)
+            update_sentiment_metrics_range(today - timedelta(days=6), today)
             logger.info("Scheduled sentiment update completed")
         except Exception as e:
             logger.error(f"Error in scheduled sentiment update: {e}")
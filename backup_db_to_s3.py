@@ -11,19 +11,23 @@ Uses boto3 to avoid AWS CLI version issues on EC2.
 import os
 import sys
 import subprocess
-import gzip
-from datetime import datetime
-from pathlib import Path
+import tempfile
+from datetime import datetime, timedelta
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 
 # Configuration
-BACKUP_DIR = Path("/tmp/db_backups")
 DB_NAME = os.environ.get("DB_NAME", "ummatics_monitor")
 DB_USER = os.environ.get("DB_USER", "postgres")
 DB_CONTAINER = os.environ.get("DB_CONTAINER", "ummatics_db")
 S3_BUCKET = os.environ.get("S3_BUCKET", "ummatics-db-backups")
 AWS_REGION = os.environ.get("AWS_DEFAULT_REGION", "us-east-1")
+# Backup keys are BACKUP_PREFIX + YYYYMMDD_HHMMSS, so S3's lexicographic listing is chronological
+BACKUP_PREFIX = "ummatics_db_backup_"
+
+# Multipart upload settings: the dump is streamed to S3 in 16 MB parts
+TRANSFER_CONFIG = TransferConfig(multipart_chunksize=16 * 1024 * 1024, use_threads=True)
 
 
 def log(message):
@@ -142,101 +146,82 @@ def create_s3_bucket(s3_client):
             return False
 
 
-def create_backup():
-    """Create PostgreSQL backup"""
+def backup_to_s3(s3_client):
+    """Stream compressed pg_dump output straight into an S3 multipart upload"""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_filename = f"ummatics_db_backup_{timestamp}.sql.gz"
-    backup_path = BACKUP_DIR / backup_filename
-    
-    log(f"Creating backup directory: {BACKUP_DIR}...")
-    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+    backup_filename = f"{BACKUP_PREFIX}{timestamp}.sql.gz"
     
     log(f"Creating database backup: {backup_filename}...")
     log(f"Database: {DB_NAME}, Container: {DB_CONTAINER}")
+    log(f"Streaming backup to S3: s3://{S3_BUCKET}/{backup_filename}...")
     
-    try:
-        # Run pg_dump in container
-        pg_dump_cmd = [
-            "docker", "exec", DB_CONTAINER,
-            "pg_dump", "-U", DB_USER, DB_NAME
-        ]
-        
-        result = subprocess.run(
-            pg_dump_cmd,
-            capture_output=True,
-            check=True
-        )
-        
-        # Compress the output
-        with gzip.open(backup_path, 'wb') as f:
-            f.write(result.stdout)
-        
-        # Get file size
-        file_size = backup_path.stat().st_size
-        file_size_mb = file_size / (1024 * 1024)
+    # Run pg_dump in container; -Z 6 makes pg_dump gzip the plain SQL itself, so the
+    # stream is already a .sql.gz that restore_db_from_s3.py can feed to psql.
+    # stderr goes to a temp file so it can never fill a pipe and stall the dump.
+    pg_dump_cmd = [
+        "docker", "exec", DB_CONTAINER,
+        "pg_dump", "-U", DB_USER, "-Z", "6", DB_NAME
+    ]
+    
+    with tempfile.TemporaryFile() as stderr_file:
+        proc = subprocess.Popen(pg_dump_cmd, stdout=subprocess.PIPE, stderr=stderr_file)
         
-        log(f"Backup created successfully: {backup_path} ({file_size_mb:.2f} MB)")
-        return backup_path, backup_filename
+        try:
+            s3_client.upload_fileobj(
+                proc.stdout,
+                S3_BUCKET,
+                backup_filename,
+                ExtraArgs={
+                    'Metadata': {
+                        'database': DB_NAME,
+                        'timestamp': datetime.now().isoformat()
+                    }
+                },
+                Config=TRANSFER_CONFIG
+            )
+        except Exception as e:
+            proc.kill()
+            proc.wait()
+            error(f"Failed to upload backup to S3: {e}")
+            return None
+        finally:
+            proc.stdout.close()
         
-    except subprocess.CalledProcessError as e:
-        error(f"Failed to create database backup: {e}")
-        error(f"stderr: {e.stderr.decode() if e.stderr else 'N/A'}")
-        return None, None
-    except Exception as e:
-        error(f"Unexpected error during backup: {e}")
-        return None, None
-
-
-def upload_to_s3(s3_client, backup_path, backup_filename):
-    """Upload backup to S3"""
-    log(f"Uploading backup to S3: s3://{S3_BUCKET}/{backup_filename}...")
+        returncode = proc.wait()
+        if returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors='replace')
+            error(f"Failed to create database backup: pg_dump exited with status {returncode}")
+            error(f"stderr: {stderr or 'N/A'}")
+            # Don't leave a truncated dump looking like a valid backup
+            try:
+                s3_client.delete_object(Bucket=S3_BUCKET, Key=backup_filename)
+                log(f"Deleted incomplete backup: {backup_filename}")
+            except ClientError as e:
+                error(f"Failed to delete incomplete backup {backup_filename}: {e}")
+            return None
     
     try:
-        s3_client.upload_file(
-            str(backup_path),
-            S3_BUCKET,
-            backup_filename,
-            ExtraArgs={
-                'Metadata': {
-                    'database': DB_NAME,
-                    'timestamp': datetime.now().isoformat()
-                }
-            }
-        )
+        file_size = s3_client.head_object(Bucket=S3_BUCKET, Key=backup_filename)['ContentLength']
+        log(f"Backup uploaded successfully ({file_size / (1024 * 1024):.2f} MB)")
+    except ClientError:
         log("Backup uploaded successfully")
-        return True
-    except ClientError as e:
-        error(f"Failed to upload backup to S3: {e}")
-        return False
-
-
-def cleanup_old_backups():
-    """Cleanup old local backups (keep last 3)"""
-    log("Cleaning up old local backups...")
-    
-    backups = sorted(BACKUP_DIR.glob("ummatics_db_backup_*.sql.gz"))
-    
-    if len(backups) > 3:
-        log(f"Found {len(backups)} local backups, keeping only the 3 most recent...")
-        for old_backup in backups[:-3]:
-            old_backup.unlink()
-            log(f"Deleted: {old_backup.name}")
-        log("Old local backups cleaned up")
-    else:
-        log(f"Only {len(backups)} local backups found, no cleanup needed")
+    return backup_filename
 
 
 def list_s3_backups(s3_client):
     """List recent backups in S3"""
     log("Recent backups in S3:")
     try:
-        response = s3_client.list_objects_v2(Bucket=S3_BUCKET)
+        # Only list backup keys from the last 30 days; they come back oldest first
+        start_after = f"{BACKUP_PREFIX}{(datetime.now() - timedelta(days=30)).strftime('%Y%m%d')}"
+        response = s3_client.list_objects_v2(Bucket=S3_BUCKET, Prefix=BACKUP_PREFIX, StartAfter=start_after)
         if 'Contents' in response:
-            for obj in sorted(response['Contents'], key=lambda x: x['LastModified'], reverse=True)[:10]:
+            for obj in reversed(response['Contents'][-10:]):
                 size_mb = obj['Size'] / (1024 * 1024)
                 log(f"  {obj['Key']} - {size_mb:.2f} MB - {obj['LastModified']}")
         else:
-            log("  No backups found in S3")
+            log("  No backups found in S3 from the last 30 days")
     except ClientError as e:
         error(f"Failed to list S3 backups: {e}")
 
@@ -261,17 +246,11 @@ def main():
     if not create_s3_bucket(s3_client):
         sys.exit(1)
     
-    # Create backup
-    backup_path, backup_filename = create_backup()
-    if not backup_path:
-        sys.exit(1)
-    
-    # Upload to S3
-    if not upload_to_s3(s3_client, backup_path, backup_filename):
+    # Create backup and upload it to S3 in one pass (nothing is written locally)
+    backup_filename = backup_to_s3(s3_client)
+    if not backup_filename:
         sys.exit(1)
     
-    # Cleanup
-    cleanup_old_backups()
     list_s3_backups(s3_client)
     
     log("=" * 50)
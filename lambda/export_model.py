@@ -0,0 +1,52 @@
+"""
+Export the DistilBERT sentiment model to ONNX at image build time.
+
+Writes model.onnx, an INT8 dynamically quantized model_quantized.onnx, its
+pre-optimized graph model_optimized.onnx, config.json and the tokenizer files to
+MODEL_CACHE_DIR so the Lambda only needs onnxruntime and a tokenizer at runtime
+(no PyTorch).
+"""
+
+import os
+import platform
+import sys
+
+import onnxruntime as ort
+from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoTokenizer
+
+MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
+MODEL_CACHE_DIR = sys.argv[1] if len(sys.argv) > 1 else "/opt/ml/model"
+
+
+def main():
+    model = ORTModelForSequenceClassification.from_pretrained(MODEL_NAME, export=True)
+    model.save_pretrained(MODEL_CACHE_DIR)
+    AutoTokenizer.from_pretrained(MODEL_NAME).save_pretrained(MODEL_CACHE_DIR)
+    print(f"Exported {MODEL_NAME} to {MODEL_CACHE_DIR}")
+
+    # INT8 weights for the image's architecture (VNNI on x86_64 Lambda, NEON dot on arm64)
+    if platform.machine() in ("aarch64", "arm64"):
+        qconfig = AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+    else:
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    ORTQuantizer.from_pretrained(MODEL_CACHE_DIR).quantize(save_dir=MODEL_CACHE_DIR, quantization_config=qconfig)
+    print(f"Quantized model written to {MODEL_CACHE_DIR}/model_quantized.onnx ({platform.machine()})")
+
+    # Run ORT's graph fusions once here and save the result, so cold starts load an
+    # already-optimized graph. EXTENDED (not ALL) keeps it portable across CPUs;
+    # the cheap hardware-specific layout passes still run at load time.
+    sess_options = ort.SessionOptions()
+    sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+    sess_options.optimized_model_filepath = os.path.join(MODEL_CACHE_DIR, "model_optimized.onnx")
+    ort.InferenceSession(
+        os.path.join(MODEL_CACHE_DIR, "model_quantized.onnx"),
+        sess_options,
+        providers=["CPUExecutionProvider"]
+    )
+    print(f"Optimized graph written to {sess_options.optimized_model_filepath}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Smoke test for the sentiment Lambda handler.
+
+onnxruntime and transformers are replaced with tiny fakes so the real
+get_sentiment_pipeline / analyze_texts / lambda_handler code paths run
+without the model. Run from the lambda directory: python -m pytest -q
+"""
+
+import json
+import os
+import sys
+import tempfile
+import types
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeTokenizer:
+    """One token per word; pads with zeros like a HF tokenizer."""
+
+    def __call__(self, texts, truncation=True, max_length=128, return_tensors=None):
+        input_ids = [[1] * min(len(text.split()), max_length) for text in texts]
+        encoded = {'input_ids': input_ids, 'attention_mask': [[1] * len(ids) for ids in input_ids]}
+        return self.pad(encoded, 'longest', return_tensors) if return_tensors else encoded
+
+    def pad(self, encoded, padding='longest', return_tensors='np'):
+        width = max(len(ids) for ids in encoded['input_ids'])
+        return {key: np.array([row + [0] * (width - len(row)) for row in rows]) for key, rows in encoded.items()}
+
+
+class FakeSession:
+    """Texts with more than two words score positive, shorter ones negative."""
+
+    def get_inputs(self):
+        return [types.SimpleNamespace(name='input_ids'), types.SimpleNamespace(name='attention_mask')]
+
+    def run(self, _, feeds):
+        words = feeds['attention_mask'].sum(axis=1).astype(np.float32)
+        return [np.stack([np.zeros_like(words), words - 2.5], axis=1)]
+
+
+def _install_fakes():
+    ort = types.ModuleType('onnxruntime')
+    ort.SessionOptions = lambda: types.SimpleNamespace(add_session_config_entry=lambda key, value: None)
+    ort.GraphOptimizationLevel = types.SimpleNamespace(ORT_ENABLE_ALL=99)
+    ort.ExecutionMode = types.SimpleNamespace(ORT_SEQUENTIAL=0)
+    ort.InferenceSession = lambda path, options, providers: FakeSession()
+    transformers = types.ModuleType('transformers')
+    transformers.AutoTokenizer = types.SimpleNamespace(from_pretrained=lambda path, use_fast=True: FakeTokenizer())
+    sys.modules['onnxruntime'] = ort
+    sys.modules['transformers'] = transformers
+
+
+class LambdaHandlerSmokeTest(unittest.TestCase):
+
+    def setUp(self):
+        _install_fakes()
+        import sentiment_function
+        self.sf = sentiment_function
+
+        # Exported model config as written by export_model.py
+        self.model_dir = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.model_dir.name, 'config.json'), 'w') as f:
+            json.dump({'id2label': {'0': 'NEGATIVE', '1': 'POSITIVE'}}, f)
+        self.sf.MODEL_CACHE_DIR = self.model_dir.name
+        self.sf.sentiment_session = None
+        self.sf._result_cache.clear()
+
+    def tearDown(self):
+        self.model_dir.cleanup()
+
+    def test_handler_scores_texts_in_order(self):
+        response = self.sf.lambda_handler(
+            {'texts': ['this is really great news', 'bad day', '', 'RT @someone: http://t.co/x']},
+            None
+        )
+
+        self.assertEqual(response['statusCode'], 200, response['body'])
+        body = json.loads(response['body'])
+        self.assertEqual(body['count'], 4)
+        self.assertEqual([r['sentiment'] for r in body['results']], ['positive', 'negative', 'neutral', 'neutral'])
+        self.assertEqual(body['results'][2]['score'], 0.0)
+
+    def test_handler_rejects_missing_texts(self):
+        response = self.sf.lambda_handler({'body': '{}'}, None)
+
+        self.assertEqual(response['statusCode'], 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
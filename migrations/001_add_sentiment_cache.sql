@@ -0,0 +1,10 @@
+-- Add the sentiment cache used by ingestion to skip re-scoring texts seen in earlier runs.
+-- New databases get this from schema.sql; apply to an existing database with:
+--   docker exec -i ummatics_db psql -U postgres -d ummatics_monitor < migrations/001_add_sentiment_cache.sql
+
+CREATE TABLE IF NOT EXISTS sentiment_cache (
+    text_sha1 CHAR(40) PRIMARY KEY,
+    sentiment VARCHAR(20) NOT NULL,
+    score DECIMAL(5, 2),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,9 @@
+-- Drop the partial per-day Twitter index if an earlier version of this migration created it.
+-- idx_social_mentions_date_platform (migration 003) leads with the same DATE(posted_at)
+-- expression followed by platform, so it already serves the per-day Twitter lookups.
+-- The partial index only added write cost on every social_mentions insert.
+-- Apply to an existing database with:
+--   docker exec -i ummatics_db psql -U postgres -d ummatics_monitor < migrations/002_drop_twitter_day_index.sql
+-- CONCURRENTLY avoids blocking ingestion writes; it cannot run inside a transaction (do not use psql -1).
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_social_mentions_twitter_day;
@@ -0,0 +1,10 @@
+-- Cover the per-day sentiment aggregation (DATE(posted_at) = ... AND platform = ...)
+-- run by update_sentiment_metrics and regenerate_historical_metrics.py. The
+-- INCLUDE columns let Postgres answer the COUNT/AVG from the index alone.
+-- New databases get this from schema.sql; apply to an existing database with:
+--   docker exec -i ummatics_db psql -U postgres -d ummatics_monitor < migrations/003_add_sentiment_day_covering_index.sql
+-- CONCURRENTLY avoids blocking ingestion writes; it cannot run inside a transaction (do not use psql -1).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_social_mentions_date_platform
+    ON social_mentions ((DATE(posted_at)), platform)
+    INCLUDE (sentiment, sentiment_score);
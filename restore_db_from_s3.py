@@ -12,10 +12,13 @@ import os
 import sys
 import subprocess
 import gzip
+import shutil
 import tempfile
+import threading
 from datetime import datetime
 from pathlib import Path
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 
 # Configuration
@@ -25,6 +28,17 @@ DB_CONTAINER = os.environ.get("DB_CONTAINER", "ummatics_db")
 S3_BUCKET = os.environ.get("S3_BUCKET", "ummatics-db-backups")
 AWS_REGION = os.environ.get("AWS_DEFAULT_REGION", "us-east-1")
 
+# Multipart download settings: 16 MB ranges fetched by up to 16 threads
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=16,
+    use_threads=True
+)
+
+# Backup keys are BACKUP_PREFIX + YYYYMMDD_HHMMSS, so S3's lexicographic listing is chronological
+BACKUP_PREFIX = "ummatics_db_backup_"
+
 
 def log(message):
     """Print timestamped log message"""
@@ -61,20 +75,20 @@ def get_latest_backup(s3_client):
     log("Fetching latest backup from S3...")
     
     try:
-        response = s3_client.list_objects_v2(Bucket=S3_BUCKET)
+        response = s3_client.list_objects_v2(Bucket=S3_BUCKET, Prefix=BACKUP_PREFIX)
         
         if 'Contents' not in response:
             error(f"No backups found in S3 bucket: {S3_BUCKET}")
             return None
         
-        backups = [obj for obj in response['Contents'] if obj['Key'].startswith('ummatics_db_backup_') and obj['Key'].endswith('.sql.gz')]
+        backups = [obj for obj in response['Contents'] if obj['Key'].endswith('.sql.gz')]
         
         if not backups:
             error(f"No valid backup files found in S3 bucket: {S3_BUCKET}")
             return None
         
-        # Sort by last modified, get latest
-        latest = sorted(backups, key=lambda x: x['LastModified'], reverse=True)[0]
+        # Keys are listed in chronological order, so the last one is the newest
+        latest = backups[-1]
         log(f"Latest backup: {latest['Key']} ({latest['Size'] / (1024*1024):.2f} MB)")
         return latest['Key']
         
@@ -93,7 +107,7 @@ def download_backup(s3_client, backup_filename):
     log(f"Downloading backup from S3: {backup_filename}...")
     
     try:
-        s3_client.download_file(S3_BUCKET, backup_filename, str(local_path))
+        s3_client.download_file(S3_BUCKET, backup_filename, str(local_path), Config=TRANSFER_CONFIG)
         
         file_size = local_path.stat().st_size
         file_size_mb = file_size / (1024 * 1024)
@@ -122,6 +136,8 @@ def database_exists(db_name):
 
 def create_database(db_name, force=False):
     """Create new database"""
+    # DROP (when needed) and CREATE run as separate -c commands of one psql session
+    commands = []
     if database_exists(db_name):
         log(f"WARNING: Database '{db_name}' already exists")
         if not force:
@@ -131,20 +147,13 @@ def create_database(db_name, force=False):
                 return False
         
         log(f"Dropping existing database: {db_name}...")
-        try:
-            subprocess.run(
-                ["docker", "exec", DB_CONTAINER, "psql", "-U", DB_USER, "-c", f"DROP DATABASE {db_name};"],
-                check=True,
-                capture_output=True
-            )
-        except subprocess.CalledProcessError as e:
-            error(f"Failed to drop database: {e}")
-            return False
+        commands += ["-c", f"DROP DATABASE {db_name};"]
     
     log(f"Creating database: {db_name}...")
+    commands += ["-c", f"CREATE DATABASE {db_name};"]
     try:
         subprocess.run(
-            ["docker", "exec", DB_CONTAINER, "psql", "-U", DB_USER, "-c", f"CREATE DATABASE {db_name};"],
+            ["docker", "exec", DB_CONTAINER, "psql", "-U", DB_USER, "-v", "ON_ERROR_STOP=1"] + commands,
             check=True,
             capture_output=True
         )
@@ -152,6 +161,8 @@ def create_database(db_name, force=False):
         return True
     except subprocess.CalledProcessError as e:
         error(f"Failed to create database: {e}")
+        if e.stderr:
+            error(f"stderr: {e.stderr.decode()}")
         return False
 
 
@@ -161,26 +172,53 @@ def restore_database(backup_path, db_name):
     log(f"Backup file: {backup_path}")
     
     try:
-        # Decompress and restore using pipe
-        with gzip.open(backup_path, 'rb') as f:
-            restore_proc = subprocess.Popen(
-                ["docker", "exec", "-i", DB_CONTAINER, "psql", "-U", DB_USER, "-d", db_name],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            
-            # Feed data to psql
-            stdout, stderr = restore_proc.communicate(input=f.read())
-            
-            if restore_proc.returncode == 0:
-                log("Database restored successfully")
-                return True
-            else:
-                error(f"Failed to restore database")
-                if stderr:
-                    error(f"stderr: {stderr.decode()}")
-                return False
+        # Decompress with pigz (multi-core) when available, else stream through gzip in-process
+        pigz = shutil.which("pigz")
+        gunzip_proc = subprocess.Popen([pigz, "-dc", str(backup_path)], stdout=subprocess.PIPE) if pigz else None
+        
+        # Apply the whole dump as one transaction and stop at the first error; the session
+        # settings skip per-commit fsync waits and give index builds more memory
+        restore_proc = subprocess.Popen(
+            ["docker", "exec", "-i",
+             "-e", "PGOPTIONS=-c synchronous_commit=off -c maintenance_work_mem=1GB",
+             DB_CONTAINER, "psql", "-U", DB_USER, "-d", db_name,
+             "--single-transaction", "--quiet", "-v", "ON_ERROR_STOP=1"],
+            stdin=gunzip_proc.stdout if gunzip_proc else subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+        
+        # Drain stderr in the background so psql never blocks on a full pipe
+        stderr_chunks = []
+        stderr_thread = threading.Thread(target=lambda: stderr_chunks.append(restore_proc.stderr.read()))
+        stderr_thread.start()
+        
+        if gunzip_proc:
+            # psql reads pigz's output directly; drop our copy of the pipe
+            gunzip_proc.stdout.close()
+        else:
+            # Feed data to psql in 1 MB chunks (never holds the whole dump in memory)
+            with gzip.open(backup_path, 'rb') as f:
+                try:
+                    shutil.copyfileobj(f, restore_proc.stdin, length=1024 * 1024)
+                finally:
+                    restore_proc.stdin.close()
+        
+        restore_proc.wait()
+        stderr_thread.join()
+        stderr = b"".join(stderr_chunks)
+        gunzip_ok = gunzip_proc is None or gunzip_proc.wait() == 0
+        
+        if restore_proc.returncode == 0 and gunzip_ok:
+            log("Database restored successfully")
+            return True
+        else:
+            error(f"Failed to restore database")
+            if not gunzip_ok:
+                error(f"pigz exited with code {gunzip_proc.returncode}")
+            if stderr:
+                error(f"stderr: {stderr.decode()}")
+            return False
                 
     except Exception as e:
         error(f"Unexpected error during restore: {e}")
@@ -192,33 +230,24 @@ def verify_restore(db_name):
     log("Verifying restored database...")
     
     try:
-        # Count tables
+        # Count tables and rows in key tables with one psql session; each -c runs on its
+        # own, so a missing table only drops its labelled line instead of aborting the rest
         result = subprocess.run(
-            ["docker", "exec", DB_CONTAINER, "psql", "-U", DB_USER, "-d", db_name, "-t", "-c",
-             "SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = 'public';"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        table_count = int(result.stdout.strip())
-        log(f"Tables found: {table_count}")
-        
-        # Count rows in key tables
-        social_result = subprocess.run(
-            ["docker", "exec", DB_CONTAINER, "psql", "-U", DB_USER, "-d", db_name, "-t", "-c",
-             "SELECT COUNT(*) FROM social_mentions;"],
+            ["docker", "exec", DB_CONTAINER, "psql", "-U", DB_USER, "-d", db_name, "-t", "-A", "-F", "|",
+             "-c", "SELECT 'tables', COUNT(*) FROM information_schema.tables WHERE table_schema = 'public';",
+             "-c", "SELECT 'social_mentions', COUNT(*) FROM social_mentions;",
+             "-c", "SELECT 'news_mentions', COUNT(*) FROM news_mentions;"],
             capture_output=True,
             text=True
         )
-        social_count = int(social_result.stdout.strip()) if social_result.returncode == 0 else 0
+        counts = dict(line.split("|", 1) for line in result.stdout.splitlines() if "|" in line)
+        if 'tables' not in counts:
+            raise RuntimeError(result.stderr.strip() or "could not count tables")
         
-        news_result = subprocess.run(
-            ["docker", "exec", DB_CONTAINER, "psql", "-U", DB_USER, "-d", db_name, "-t", "-c",
-             "SELECT COUNT(*) FROM news_mentions;"],
-            capture_output=True,
-            text=True
-        )
-        news_count = int(news_result.stdout.strip()) if news_result.returncode == 0 else 0
+        table_count = int(counts['tables'])
+        log(f"Tables found: {table_count}")
+        social_count = int(counts.get('social_mentions', 0))
+        news_count = int(counts.get('news_mentions', 0))
         
         log(f"Social mentions: {social_count}")
         log(f"News mentions: {news_count}")
@@ -240,7 +269,6 @@ def cleanup(restore_dir):
     log("Cleaning up downloaded backup...")
     try:
         if restore_dir.exists():
-            import shutil
             shutil.rmtree(restore_dir)
         log("Cleanup complete")
     except Exception as e:
@@ -152,10 +152,20 @@ CREATE TABLE IF NOT EXISTS discovered_subreddits (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Sentiment scores keyed by SHA-1 of the cleaned text, reused across ingestion runs
+CREATE TABLE IF NOT EXISTS sentiment_cache (
+    text_sha1 CHAR(40) PRIMARY KEY,
+    sentiment VARCHAR(20) NOT NULL,
+    score DECIMAL(5, 2),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Create indexes for better query performance
 CREATE INDEX idx_weekly_snapshots_date ON weekly_snapshots(week_start_date);
 CREATE INDEX idx_social_media_metrics_date ON social_media_metrics(week_start_date);
 CREATE INDEX idx_social_mentions_date ON social_mentions(week_start_date);
+-- Per-day lookups and sentiment aggregation (DATE(posted_at) + platform), index-only for the sentiment columns
+CREATE INDEX idx_social_mentions_date_platform ON social_mentions((DATE(posted_at)), platform) INCLUDE (sentiment, sentiment_score);
 CREATE INDEX idx_website_metrics_date ON website_metrics(week_start_date);
 CREATE INDEX idx_top_pages_date ON top_pages(week_start_date);
 CREATE INDEX idx_geographic_metrics_date ON geographic_metrics(week_start_date);